@@ -1,14 +1,6 @@
-import lasio
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-import tempfile
-import missingno as ms
-import lascheck
-import traceback
-from PIL import Image
+import time
+import assets
 from streamlit_option_menu import option_menu
 
 st.set_page_config(
@@ -44,20 +36,40 @@ if selected_menu == "Home":
                 ''')
 
 if selected_menu == "About":
-    img_about = Image.open("About_us.jpg")    
-    st.image(img_about)
+    st.image(assets.get_image("About_us.jpg", width=assets.PHOTO_WIDTH))
 
 if selected_menu == "User's Guide":
     st.subheader("How to Use the Web Application")
+    
+    # One page at a time; only the page and the thumbnails on screen are loaded
+    pages = assets.manual_pages()
+    if "manual_page" not in st.session_state:
+        st.session_state["manual_page"] = 0
+    
+    def go_to(index):
+        st.session_state["manual_page"] = min(max(index, 0), len(pages) - 1)
+    
+    current = st.session_state["manual_page"]
+    prev_col, info_col, next_col = st.columns([1, 4, 1])
+    prev_col.button("Previous", on_click=go_to, args=(current - 1,), disabled=current == 0)
+    info_col.markdown(f"<div style='text-align: center'>Page {current + 1} of {len(pages)}</div>",
+                      unsafe_allow_html=True)
+    next_col.button("Next", on_click=go_to, args=(current + 1,), disabled=current == len(pages) - 1)
+    st.image(assets.page(current), use_column_width=True)
+    
+    # Thumbnails of the neighbouring pages
+    first = min(max(current - 4, 0), max(len(pages) - 9, 0))
+    for column, index in zip(st.columns(9), range(first, min(first + 9, len(pages)))):
+        column.image(assets.thumbnail(index), caption=f"{index + 1}", use_column_width=True)
+        column.button("Open", key=f"manual_thumb_{index}", on_click=go_to, args=(index,),
+                      disabled=index == current)
 
 if selected_menu == "Additional Info":    
     st.subheader('Porosity Calculation and Evaluation')
 
 
 # Display the image in Streamlit
-    img_wyllie = Image.open("Sonic_Formula.png")
-    img_wyllie = img_wyllie.resize([int(img_wyllie.width/3), int(img_wyllie.height/3.5)])
-    st.image(img_wyllie, caption= 'Figure 1. Wyllie time average equation')
+    st.image(assets.get_image("Sonic_Formula.png", divide=(3, 3.5)), caption= 'Figure 1. Wyllie time average equation')
     
     
     st.markdown('''The Wyllie time average method is used for estimating porosity from sonic measurements. 
@@ -68,9 +80,7 @@ if selected_menu == "Additional Info":
              \nΔtma = Rock matrix interval transit time    
                  ''')
     
-    img_transit = Image.open("Transit_Time.png")
-    img_transit = img_transit.resize([int(img_transit.width/3), int(img_transit.height/3.5)])
-    st.image(img_transit, caption= 'Figure 2. Typical interval transit time for lithologies and fluids')
+    st.image(assets.get_image("Transit_Time.png", divide=(3, 3.5)), caption= 'Figure 2. Typical interval transit time for lithologies and fluids')
     st.divider()
     
     st.subheader('Uncompacted Formation and Hydrocarbon-bearing Zone')
@@ -83,9 +93,7 @@ if selected_menu == "Additional Info":
                 analyzing the sonic response in nearby shale (Cp = Δtsh/100.0).
                 \nHy, on the other hand, is an approximate correction factor and is assigned a value of 0.9 for oil and 0.7 for gas reservoirs.
                 \nWith these adjustments, the revised Wyllie time average equation is as follows:''')
-    img_correction = Image.open("Correction.png")
-    img_correction = img_correction.resize([int(img_correction.width/3), int(img_correction.height/3.5)])
-    st.image(img_correction, caption= 'Figure 3. Wyllie time average equation with correction')
+    st.image(assets.get_image("Correction.png", divide=(3, 3.5)), caption= 'Figure 3. Wyllie time average equation with correction')
     st.markdown('''Cp = Compaction correction factor
                 \nHy = Hydrocarbon correction factor  ''')
     st.divider()
@@ -103,48 +111,36 @@ if selected_menu == "Additional Info":
 
     # path_pdf_abbvr = r"C:\Users\Malasique\Documents\GitHub\Sonic-Log-Interpreter-Web-Application\reeves_mnemonics.pdf"
     # st.markdown(f'<a href = {path_pdf_abbvr} download="document.pdf">Click here to download complete tools and curve mnemonics.</a>', unsafe_allow_html=True)           
-    img_abbrv = Image.open("Curves_Abbrv.png")
-    img_abbrv = img_abbrv.resize([int(img_abbrv.width/1.5), int(img_abbrv.height/1.5)])
-    st.image(img_abbrv, caption= 'Figure 4. List of common log curve abbreviations (mnemonics) and their corresponding names or descriptions' )
+    st.image(assets.get_image("Curves_Abbrv.png", divide=(1.5, 1.5)), caption= 'Figure 4. List of common log curve abbreviations (mnemonics) and their corresponding names or descriptions' )
 
     
 if selected_menu == "Interpretation":
-    
-    # Function to set interval transit values in μsec/m
-    def unit_meter():
-        global dt_matrix_sandstone
-        global dt_matrix_limestone
-        global dt_matrix_dolomite
-        global dt_fluid_seawater
-        global dt_fluid_freshwater
-        global correction_oil
-        global correction_gas
-        
-        dt_matrix_sandstone = 55.5 * 12 * 2.54 * 0.01
-        dt_matrix_limestone = 47.5 * 12 * 2.54 * 0.01
-        dt_matrix_dolomite = 43.5 * 12 * 2.54 * 0.01
-        dt_fluid_seawater = 189 * 12 * 2.54 * 0.01
-        dt_fluid_freshwater = 204 * 12 * 2.54 * 0.01
-        correction_oil = 0.9
-        correction_gas = 0.7
-
-    # Function to set interval transit values in μsec/ft
-    def unit_feet():
-        global dt_matrix_sandstone
-        global dt_matrix_limestone
-        global dt_matrix_dolomite
-        global dt_fluid_seawater
-        global dt_fluid_freshwater
-        global correction_oil
-        global correction_gas
-        
-        dt_matrix_sandstone = 55.5
-        dt_matrix_limestone = 47.5
-        dt_matrix_dolomite = 43.5
-        dt_fluid_seawater = 189
-        dt_fluid_freshwater = 204
-        correction_oil = 0.9
-        correction_gas = 0.7
+    # Data modules are imported only once the Interpretation page is opened, so
+    # the other pages start fast; sub-tabs import what only they need
+    # (lascheck, matplotlib, plotly, multiprocessing)
+    import pandas as pd
+    import column_graph
+    import compaction
+    import instrument
+    import las_loader
+    import lru
+    import porosity
+    import result_curves
+    import sonic_qc
+    import zonation
+    
+    # Opt-in per-stage timing and memory of each rerun (sidebar toggle or $SONIC_PROFILE)
+    if "profiler" not in st.session_state:
+        st.session_state["profiler"] = instrument.Profiler()
+    profiler = st.session_state["profiler"]
+    profiler.start_rerun(st.sidebar.checkbox("Profile reruns", value=instrument.enabled_by_env(),
+                                             key="profile_reruns"))
+    # float32 curves and implicit depth, for servers with many concurrent sessions
+    compact = st.sidebar.checkbox("Compact memory mode (float32)", value=las_loader.compact_by_env(),
+                                  key="compact_mode")
+    # Chosen before any check starts; the background worker keeps the page responsive
+    conformity_background = st.sidebar.checkbox("Run the conformity check in the background", value=True,
+                                                key="conformity_background")
     
     def create_option_menu():
         return option_menu(
@@ -161,47 +157,56 @@ if selected_menu == "Interpretation":
         ) 
     
     def las_file_specification():
+        import conformity
         st.subheader("LAS File Conformity Check Result:")
-        try:
-            if tfile is None:
-                las = lascheck.read(file)
-            else:
-                las = lascheck.read(tfile.name)  # Use the path of the temporary file
-    
+        # The check runs once per file hash (compact or not); later reruns reuse the cached result
+        result = conformity.get_result(well.content_hash)
+        if result is None:
+            # The path of the sample file, or the in-memory upload buffer the well was parsed from
+            source = file if isinstance(file, str) else content
             st.text("Checking LAS file conformity...")
     
-            # Initialize the progress bar
+            # Progress bar driven by the section being read
             progress_bar = st.progress(0)
             progress_status = st.empty()
     
-            # Simulate progress by updating the progress bar
-            for percent_complete in range(0, 101):
-                progress_bar.progress(percent_complete)
-                progress_status.text(f"Checking progress: {percent_complete}%")
-    
-            # Once the checking is complete, display the results
-            st.write("LAS file conformity check complete.")
-            if las.check_conformity() == True:
-                st.write('**Result:** No non-conformities were found in the LAS file.')
-            if las.check_conformity() == False:
-                st.write('**Result:** Non-conformities were found in the LAS file.')
-                st.write(las.get_non_conformities())
-    
-        except ValueError as ve:
-            # Handle the specific error gracefully
-            st.warning(f"An error occurred while processing the LAS file: {ve}")
-            # Capture and display the traceback
-            st.write("Traceback:")
-            st.code(traceback.format_exc())
-    
-        except Exception as e:
-            # Handle the exception gracefully
-            st.warning(f"An error occurred while processing the LAS file: {e}")
-            # Capture and display the traceback
+            def show_progress(fraction, message):
+                progress_bar.progress(int(fraction * 100))
+                progress_status.text(f"{message}: {fraction:.0%}")
+    
+            if conformity_background:
+                job = conformity.submit(well.content_hash, source)
+                show_progress(job.fraction, job.message)
+                if not job.done():
+                    # Poll the worker until the check is complete
+                    time.sleep(0.5)
+                    st.rerun()
+                result = job.result()
+            else:
+                with profiler.stage("conformity check"):
+                    result = conformity.check(well.content_hash, source, show_progress)
+    
+        # Once the checking is complete, display the results
+        st.write("LAS file conformity check complete.")
+        if result.error is not None:
+            # Handle the error gracefully and display the traceback
+            st.warning(f"An error occurred while processing the LAS file: {result.error}")
             st.write("Traceback:")
-            st.code(traceback.format_exc())
+            st.code(result.details)
+        elif result.conforms:
+            st.write('**Result:** No non-conformities were found in the LAS file.')
+        else:
+            st.write('**Result:** Non-conformities were found in the LAS file.')
+            st.write(result.non_conformities)
     
         st.warning('**Note**: "-999.25" is the standard value for a Null value ')
+        if well.null_report:
+            st.markdown('**Null values masked at ingest** (excluded from porosity and plots):')
+            st.dataframe(pd.DataFrame(
+                [(curve, sentinel, count)
+                 for curve, found in well.null_report.items()
+                 for sentinel, count in found.items()],
+                columns=["Curve", "Null Value", "Samples"]))
         st.divider()    
 
     def display_well_information():
@@ -220,44 +225,94 @@ if selected_menu == "Interpretation":
         st.divider()
     
     def display_curve_data_overview():
+        import coverage
+        import figure_cache
         st.subheader('Curve Data Overview')
-        st.markdown('''The value on the left figure is the number of rows. White space in each column of the curve is a missing value row/data. 
-                        Expand to see more details''')
-        st.pyplot(ms.matrix(las_df, sparkline=False, labels=100).figure)
+        st.markdown('''Each column of the figure is a curve along depth. White space in a column is a missing value interval. 
+                        The table gives the coverage, the valid depth range and the gaps of each curve.''')
+        depth = well.columns["DEPTH"]
+        with profiler.stage("coverage overview"):
+            st.image(figure_cache.get_png(lru.inputs_key("coverage", well.key),
+                                          lambda: coverage.plot_coverage(depth, well.null_runs)),
+                     use_column_width=True)
+            st.dataframe(coverage.coverage_summary(depth, well.null_runs), use_container_width=True)
         st.divider()
     
+    def batch_interpretation():
+        import io
+        import multiprocessing
+        import zipfile
+        import batch
+        import pipeline
+        st.subheader('Batch Interpretation')
+        st.markdown('''Run the same matrix, fluid and correction setup over many wells. 
+                    The sonic curve of each well is detected from its unit (us/m, us/ft) or its mnemonic (DT...).''')
+        files = st.file_uploader('Upload the LAS files', accept_multiple_files=True, key="batch_files")
+        models = st.multiselect(
+            "**Sonic Porosity:**", porosity.MODELS, default=porosity.MODELS[:1],
+            format_func=lambda model: porosity.model_label(*model))
+        correction = st.radio("Hydrocarbon Correction:", ('None', 'Oil Correction', 'Gas Correction'),
+                              key="batch_correction", horizontal=True)
+        average = st.checkbox("Average", key="batch_average")
+        method = st.selectbox("Result Curve:", result_curves.RESULT_METHODS, key="batch_result")
+    
+        if st.button("Run batch", disabled=not files):
+            spec = pipeline.InterpretationSpec(models, correction, average, method)
+            # Spawned workers do not inherit the threads of the Streamlit server
+            with profiler.stage("batch run"):
+                summary_df, results, stats = batch.run_batch(
+                    [(f.name, f.getvalue()) for f in files], spec, mp_context=multiprocessing.get_context("spawn"))
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("summary.csv", summary_df.to_csv(index=False))
+                for name, csv_bytes in results.items():
+                    zf.writestr(f"{name.rsplit('.', 1)[0]}_sonic_porosity.csv", csv_bytes)
+            st.session_state["batch_output"] = (summary_df, archive.getvalue(), stats)
+    
+        if "batch_output" in st.session_state:
+            summary_df, archive, stats = st.session_state["batch_output"]
+            st.markdown(f"**{stats['wells']} wells, {stats['samples']} samples in {stats['seconds']:.2f} s** "
+                        f"({stats['wells_per_sec']:.1f} wells/sec, {stats['samples_per_sec']:.0f} samples/sec)")
+            st.dataframe(summary_df)
+            st.download_button("Download results", archive, file_name="batch_results.zip",
+                               key="batch_download", mime="application/zip")
+    
     st.set_option('deprecation.showfileUploaderEncoding', False)
-    tfile = None
     file = None
     selected_tab = None
     
     mode = st.radio(
         "**Select an option:**",
-        ('Upload LAS file', 'Use sample LAS file')
+        ('Upload LAS file', 'Use sample LAS file', 'Batch interpretation')
     )
     st.divider()
     
+    if mode == 'Batch interpretation':
+        batch_interpretation()
+    
     
     if mode == 'Upload LAS file':
         file = st.file_uploader('Upload the LAS file')
         if file is not None:
-            # Create a temporary file and save the uploaded file's content into it
-            with tempfile.NamedTemporaryFile(delete=False) as tfile:
-                tfile.write(file.read())
-                las_file = lasio.read(tfile.name)
-                las_df = las_file.df()
+            # The upload is parsed straight from its in-memory buffer, no temporary file
+            content = las_loader.upload_buffer(file)
+            # Parsed wells are cached by content hash, so reruns skip lasio
+            with profiler.stage("load LAS"):
+                well = las_loader.load_las(content, compact)
+                las_file = well.las_file
+                las_df = well.df()
             
     
     if mode == 'Use sample LAS file':
         file = r"Sample.las"
-        las_file = lasio.read(file)
-        las_df = las_file.df()
+        with profiler.stage("load LAS"):
+            well = las_loader.load_las_path(file, compact)
+            las_file = well.las_file
+            las_df = well.df()
         
         
     if file:
       selected_tab = create_option_menu()
-      las_df.insert(0, 'DEPTH', las_df.index)
-      las_df.reset_index(drop=True, inplace=True)
     
       try:
         well_name =  las_file.header['Well'].WELL.value
@@ -294,7 +349,7 @@ if selected_menu == "Interpretation":
           
         try:
               unit_curve = las_file.curves[selected_column].unit  # Get unit from the selected curve
-              if unit_curve.upper() not in ('US/M', 'US/FT', 'US/F'):
+              if unit_curve.upper() not in las_loader.SONIC_UNITS:
                   st.warning('**Warning**: Unit must be either (us/m) or (us/ft). Assuming the selected curve data is Sonic and its unit is us/ft.')
         except KeyError:
               if selected_column == "DEPTH":
@@ -306,159 +361,112 @@ if selected_menu == "Interpretation":
             
         # Determine which unit to use based on unit_curve
         if unit_curve.upper() == 'US/M':
-            unit_meter()
+            dt_unit = 'US/M'
         elif unit_curve.upper() == 'US/FT' or 'US/F': 
-            unit_feet()
+            dt_unit = 'US/FT'
         else:
             st.warning('**Warning**: Unit must be either (us/m) or (us/ft). Assuming the selected curve data is Sonic and its unit is us/ft')
-            unit_feet()
+            dt_unit = 'US/FT'
         
         st.sidebar.subheader('Sonic Porosity:')
         if file:
-            mode_sandstone_seawater = st.sidebar.checkbox("Matrix: Sandstone | Fluid: Seawater")
-            mode_limestone_seawater = st.sidebar.checkbox("Matrix: Limestone | Fluid: Seawater")
-            mode_dolomite_seawater = st.sidebar.checkbox("Matrix: Dolomite | Fluid: Seawater")
-            mode_sandstone_freshwater = st.sidebar.checkbox("Matrix: Sandstone | Fluid: Freshwater") 
-            mode_limestone_freshwater = st.sidebar.checkbox("Matrix: Limestone | Fluid: Freshwater")
-            mode_dolomite_freshwater = st.sidebar.checkbox("Matrix: Dolomite | Fluid: Freshwater")
+            selected_models = [
+                (matrix, fluid) for matrix, fluid in porosity.MODELS
+                if st.sidebar.checkbox(porosity.model_label(matrix, fluid))
+            ]
             mode_average = st.sidebar.checkbox("Average")
         
         mode = st.sidebar.radio(
               "Hydrocarbon Correction:",
               ('None', 'Oil Correction', 'Gas Correction'))
+        
+        # Cycle-skip and spike QC of the sonic curve, optionally despiked before porosity
+        despike_spec = None
+        sonic_qc_mode = st.sidebar.checkbox("Sonic QC (Cycle Skips / Spikes)")
+        if sonic_qc_mode:
+            spike_window = st.sidebar.number_input(
+                "QC Window (samples):", min_value=3, value=sonic_qc.WINDOW, step=2)
+            spike_threshold = st.sidebar.number_input(
+                "QC Threshold (robust sigmas):", min_value=1.0, value=sonic_qc.THRESHOLD, step=0.5)
+            if st.sidebar.checkbox("Despike Before Porosity"):
+                despike_spec = (int(spike_window), float(spike_threshold))
+        
+        # Compaction correction: Cp from the shale DT trend picked on gamma ray
+        compaction_spec = None
+        if st.sidebar.checkbox("Compaction Correction (Cp)"):
+            gr_curves = [curve["mnemonic"] for curve in well.curves[1:]]
+            default_gr = compaction.gamma_ray_curve(well)
+            gr_curve = st.sidebar.selectbox("Gamma Ray Curve:", gr_curves,
+                                            index=gr_curves.index(default_gr) if default_gr in gr_curves else 0)
+            gr_bounds = compaction.gr_range(well.columns[gr_curve])
+            if gr_bounds is None:
+                st.sidebar.warning(f"**Warning**: {gr_curve} has no valid readings. Compaction correction is not applied.")
+            else:
+                gr_cutoff = st.sidebar.slider(
+                    "Shale GR Cutoff:", min_value=gr_bounds[0], max_value=gr_bounds[1],
+                    value=min(max(compaction.default_cutoff(well.columns[gr_curve]), gr_bounds[0]), gr_bounds[1]))
+                shale_window = st.sidebar.number_input(
+                    "Shale Trend Window (depth units):", min_value=0.0,
+                    value=compaction.SHALE_WINDOW, step=10.0)
+                compaction_spec = (gr_curve, gr_cutoff, shale_window)
             
         # Check if 'DT' is a valid curve in the LAS file
-        data = []
-        temporary = []
         if selected_column in las_file.keys():
-            for depth, dt_log in zip(las_df['DEPTH'], las_df[selected_column]):
-                # Always include depth and Sonic Log Reading
-                row_data = {"Depth": depth, 'Sonic Log Reading': dt_log}
-                  
-                if mode == 'None':
-                    
-                    if mode_sandstone_seawater:
-                        phi_sandstone_seawater = (dt_log - dt_matrix_sandstone) / (dt_fluid_seawater - dt_matrix_sandstone)
-                        row_data['Sonic_Sandstone_Seawater'] = phi_sandstone_seawater
-    
-                    if mode_limestone_seawater:
-                        phi_limestone_seawater = (dt_log - dt_matrix_limestone) / (dt_fluid_seawater - dt_matrix_limestone)
-                        row_data['Sonic_Limestone_Seawater'] = phi_limestone_seawater
-                    
-                    if mode_dolomite_seawater:
-                        phi_dolomite_seawater = (dt_log - dt_matrix_dolomite) / (dt_fluid_seawater - dt_matrix_dolomite)
-                        row_data['Sonic_Dolomite_Seawater'] = phi_dolomite_seawater
-                    
-                    if mode_sandstone_freshwater:
-                        phi_sandstone_freshwater = (dt_log - dt_matrix_sandstone) / (dt_fluid_freshwater - dt_matrix_sandstone)
-                        row_data['Sonic_Sandstone_Freshwater'] = phi_sandstone_freshwater
-                    
-                    if mode_limestone_freshwater:
-                        phi_limestone_freshwater = (dt_log - dt_matrix_limestone) / (dt_fluid_freshwater - dt_matrix_limestone)
-                        row_data['Sonic_Limestone_Freshwater'] = phi_limestone_freshwater
-                    
-                    if mode_dolomite_freshwater:
-                        phi_dolomite_freshwater = (dt_log - dt_matrix_dolomite) / (dt_fluid_freshwater - dt_matrix_dolomite)
-                        row_data['Sonic_Dolomite_Freshwater'] = phi_dolomite_freshwater
-                        
-                    # Add similar conditions for other checkboxes (e.g., mode_limestone_freshwater, mode_dolomite_freshwater, etc.)  
-                    data.append(row_data)      
-                
-                if mode == 'Oil Correction':
-                    
-                    if mode_sandstone_seawater:
-                        phi_sandstone_seawater = (dt_log - dt_matrix_sandstone) / (dt_fluid_seawater - dt_matrix_sandstone)
-                        row_data['Sonic_Sandstone_Seawater'] = phi_sandstone_seawater * correction_oil
-                    
-                    if mode_limestone_seawater:
-                        phi_limestone_seawater = (dt_log - dt_matrix_limestone) / (dt_fluid_seawater - dt_matrix_limestone)
-                        row_data['Sonic_Limestone_Seawater'] = phi_limestone_seawater * correction_oil
-                    
-                    if mode_dolomite_seawater:
-                        phi_dolomite_seawater = (dt_log - dt_matrix_dolomite) / (dt_fluid_seawater - dt_matrix_dolomite)
-                        row_data['Sonic_Dolomite_Seawater'] = phi_dolomite_seawater * correction_oil
-                    
-                    if mode_sandstone_freshwater:
-                        phi_sandstone_freshwater = (dt_log - dt_matrix_sandstone) / (dt_fluid_freshwater - dt_matrix_sandstone)
-                        row_data['Sonic_Sandstone_Freshwater'] = phi_sandstone_freshwater * correction_oil
-                    
-                    if mode_limestone_freshwater:
-                        phi_limestone_freshwater = (dt_log - dt_matrix_limestone) / (dt_fluid_freshwater - dt_matrix_limestone)
-                        row_data['Sonic_Limestone_Freshwater'] = phi_limestone_freshwater * correction_oil
-                    
-                    if mode_dolomite_freshwater:
-                        phi_dolomite_freshwater = (dt_log - dt_matrix_dolomite) / (dt_fluid_freshwater - dt_matrix_dolomite)
-                        row_data['Sonic_Dolomite_Freshwater'] = phi_dolomite_freshwater * correction_oil
-                        
-                    # Add similar conditions for other checkboxes (e.g., mode_limestone_freshwater, mode_dolomite_freshwater, etc.)
-                    data.append(row_data)
-                
-                if mode == 'Gas Correction':
-                      
-                    if mode_sandstone_seawater:
-                        phi_sandstone_seawater = (dt_log - dt_matrix_sandstone) / (dt_fluid_seawater - dt_matrix_sandstone)
-                        row_data['Sonic_Sandstone_Seawater'] = phi_sandstone_seawater * correction_gas
-                    
-                    if mode_limestone_seawater:
-                        phi_limestone_seawater = (dt_log - dt_matrix_limestone) / (dt_fluid_seawater - dt_matrix_limestone)
-                        row_data['Sonic_Limestone_Seawater'] = phi_limestone_seawater * correction_gas
-                    
-                    if mode_dolomite_seawater:
-                        phi_dolomite_seawater = (dt_log - dt_matrix_dolomite) / (dt_fluid_seawater - dt_matrix_dolomite)
-                        row_data['Sonic_Dolomite_Seawater'] = phi_dolomite_seawater * correction_gas
-                    
-                    if mode_sandstone_freshwater:
-                        phi_sandstone_freshwater = (dt_log - dt_matrix_sandstone) / (dt_fluid_freshwater - dt_matrix_sandstone)
-                        row_data['Sonic_Sandstone_Freshwater'] = phi_sandstone_freshwater * correction_gas
-                    
-                    if mode_limestone_freshwater:
-                        phi_limestone_freshwater = (dt_log - dt_matrix_limestone) / (dt_fluid_freshwater - dt_matrix_limestone)
-                        row_data['Sonic_Limestone_Freshwater'] = phi_limestone_freshwater * correction_gas
-                    
-                    if mode_dolomite_freshwater:
-                        phi_dolomite_freshwater = (dt_log - dt_matrix_dolomite) / (dt_fluid_freshwater - dt_matrix_dolomite)
-                        row_data['Sonic_Dolomite_Freshwater'] = phi_dolomite_freshwater * correction_gas
-                        
-                    # Add similar conditions for other checkboxes (e.g., mode_limestone_freshwater, mode_dolomite_freshwater, etc.)
-                    data.append(row_data)
-                    
-      # Create the DataFrame with appropriate columns
-        las_df_revised = pd.DataFrame(data)
-        if mode_average:
-          las_df_revised['Average Porosity'] = las_df_revised.iloc[:, 2:].mean(axis=1)  
+            # Each porosity column is a cached node of the graph: ticking one more
+            # model only computes that column, the average and the result curve
+            porosity_graph = column_graph.PorosityGraph(
+                well, selected_column, selected_models, correction=mode, unit=dt_unit, average=mode_average,
+                compaction=compaction_spec, despike=despike_spec)
+            with profiler.stage("porosity"):
+                las_df_revised = porosity_graph.frame()
+            if porosity_graph.cp is not None:
+                cp = porosity_graph.cp.value()
+                st.sidebar.caption(
+                    f"Shale: {compaction.shale_fraction(well.columns[gr_curve], gr_cutoff):.0%} of samples | "
+                    f"Cp: {cp.min():.2f} to {cp.max():.2f}")
+        else:
+            las_df_revised = pd.DataFrame()
+        
+        # Result curve shared by Track 3, the data table and Formation Evaluation
+        result_method = st.sidebar.selectbox(
+            "Result Curve:",
+            list(result_curves.RESULT_METHODS) + result_curves.porosity_columns(las_df_revised))
+        result_name = result_curves.result_name(result_method)
+        if not las_df_revised.empty:
+            with profiler.stage("result curve"):
+                result_df = porosity_graph.result_frame(result_method)
     
         # Display the DataFrame as a presentable Excel-like table      
-        if data == [] or selected_column == "DEPTH":
-          for depth in (las_df["DEPTH"]):
-            las_temporary = {"Depth": depth}
-            temporary.append(las_temporary)
-              
-          temp = pd.DataFrame(temporary)
+        if las_df_revised.empty or selected_column == "DEPTH":
+          temp = pd.DataFrame({"Depth": las_df["DEPTH"].to_numpy()})
           st.subheader('Data Sets:')
           st.dataframe(temp)
         else:
           st.subheader('Data Sets:')
-          st.dataframe(las_df_revised)
+          with profiler.stage("data table"):
+              st.dataframe(las_df_revised.assign(**{result_name: result_df[result_name].to_numpy()}))
+          
+          if sonic_qc_mode:
+              st.subheader('Sonic QC:')
+              with profiler.stage("sonic QC"):
+                  spikes = porosity_graph.spike_intervals(int(spike_window), float(spike_threshold))
+              counts = spikes["Kind"].value_counts()
+              st.write(f"{len(spikes)} flagged intervals: "
+                       + ", ".join(f"{counts.get(kind, 0)} {kind.lower()}" for kind in sonic_qc.KINDS)
+                       + (" (despiked before porosity)" if despike_spec else ""))
+              st.dataframe(spikes, use_container_width=True)
      
 
         
 
         
     if selected_tab == "Log Visualization":   
-        # Default values for visualization
-        plot_h_fig1 = 27
-        plot_w_fig1 = 22
-        plot_h_fig23 = 12
-        plot_w_fig23 = 16
-        title_size = 12
-        title_height = 1.0
-        line_width = 1
-        dt_color = 'black'
-        trackname_1 = f'Sonic Log\n{unit_curve}'
-        trackname_2 = 'Sonic Porosity\np.u.'
-        trackname_3 = 'Result\np.u.'
-    
+        import figure_cache
+        import log_plot
+        import log_viewer
+        import report
         # Sidebar for user input
+        viewer = st.sidebar.radio("Log Viewer:", ('Static', 'Interactive (WebGL)'), key="viewer")
         st.sidebar.header("Depth Selection")
         top_depth = st.sidebar.number_input('Top Depth', min_value=0.00, value=start_depth, step=100.00, key="top_depth")
         bot_depth = st.sidebar.number_input('Bottom Depth', min_value=0.00, value=stop_depth, step=100.00, key="bot_depth")
@@ -478,195 +486,44 @@ if selected_menu == "Interpretation":
         result_right = st.sidebar.number_input('Right Scale', min_value=-0.151, max_value=1.51, value=-0.15, step=0.05, key="result_right")
         grid_num_3 = st.sidebar.number_input('Number of Grids', min_value=0, value=10, step=1, key="grid_num_3")    
         
-        # Create a subplot with 1 row and 3 columns
-        fig, ax = plt.subplots(nrows=1, ncols=3, figsize=(plot_w_fig1, plot_h_fig1), sharey=True)
+        plot_settings = {
+            "unit_curve": unit_curve,
+            "top_depth": top_depth, "bot_depth": bot_depth,
+            "dt_left": dt_left, "dt_right": dt_right, "grid_num_1": grid_num_1,
+            "phis_left": phis_left, "phis_right": phis_right, "grid_num_2": grid_num_2,
+            "result_left": result_left, "result_right": result_right, "grid_num_3": grid_num_3,
+        }
+        
+        # Everything the figures depend on; rendered images are cached on these inputs
+        data_inputs = (well.key, selected_column, dt_unit, mode, tuple(selected_models), mode_average,
+                       compaction_spec, despike_spec)
+        plot_inputs = data_inputs + (result_method, plot_settings)
         
-        # # Set the super title for the entire figure
-        # fig.suptitle("Sonic Log Interpretation")
-        if data == [] or selected_column == "DEPTH":
-          ax1 = plt.subplot2grid((1, 3), (0, 0), rowspan=1, colspan=1)
-          ax2 = plt.subplot2grid((1, 3), (0, 1), rowspan=1, colspan=1)
-          ax3 = plt.subplot2grid((1, 3), (0, 2), rowspan=1, colspan=1)
+        if las_df_revised.empty or selected_column == "DEPTH":
           st.subheader('Log Visualization')
-          st.pyplot(fig)
+          st.image(figure_cache.get_png(("empty",), log_plot.plot_empty_tracks), use_column_width=True)
         else:
-            # =============================================================================
-            # Subplot 1
-            ax1 = plt.subplot2grid((1, 3), (0, 0), rowspan=1, colspan=1)
-        
-            # Sonic Log Reading track
-            ax1.plot(las_df_revised['Sonic Log Reading'], las_df_revised['Depth'], color=dt_color, lw=line_width)
-            ax1.set_xlabel(trackname_1)
-            ax1.set_xlim(dt_left, dt_right)
-            ax1.set_ylim(bot_depth, top_depth)
-            ax1.xaxis.label.set_color(dt_color)
-            ax1.tick_params(axis='x', colors=dt_color)
-            ax1.spines["top"].set_edgecolor(dt_color)
-            ax1.spines["top"].set_position(("axes", 1.02))
-        
-            # Calculate the middle value
-            dt_middle = (dt_left + dt_right) / 2
-        
-            # Calculate the grid interval
-            grid_interval = (dt_right - dt_left) / (grid_num_1 - 1)
-        
-            # Generate the list of x-axis tick positions
-            xtick_positions = [round(dt_left, 2), round(dt_middle, 2), round(dt_right, 2)]
-        
-            # Generate the list of grid positions
-            grid_positions = np.linspace(dt_left, dt_right, num=grid_num_1)
-        
-            # Set the x-axis ticks and labels
-            ax1.set_xticks(xtick_positions)
-            ax1.set_xticklabels([f"{x:.2f}" for x in xtick_positions])
-        
-            # Set the grid lines
-            ax1.set_xticks(grid_positions, minor=True)
-            ax1.grid(which='minor', linestyle='--', linewidth=0.5)
-        
-            # Major and minor grid lines
-            ax1.grid(which='major', color='silver', linestyle='-')
-            ax1.grid(which='minor', color='lightgrey', linestyle=':', axis='y')
-            ax1.xaxis.set_ticks_position("top")
-            ax1.xaxis.set_label_position("top")
-        
-            # =============================================================================
-            # Subplot 2
-            ax2 = plt.subplot2grid((1, 3), (0, 1), rowspan=1, colspan=1)
-        
-            # Select all columns in las_df_revised except "Depth" and "Sonic Log Reading"
-            columns_to_plot = [col for col in las_df_revised.columns if col not in ["Depth", "Sonic Log Reading"]]
-        
-        
-            # Plot the selected columns against 'Depth'
-            for column in columns_to_plot:
-                ax2.plot(las_df_revised[column], las_df_revised['Depth'], label=column)
-        
-            ax2.set_xlabel(trackname_2)
-            ax2.set_xlim(phis_left, phis_right)
-            ax2.set_ylim(bot_depth, top_depth)
-            ax2.xaxis.label.set_color(dt_color)
-            ax2.tick_params(axis='x', colors=dt_color)
-            ax2.spines["top"].set_edgecolor(dt_color)
-            ax2.spines["top"].set_position(("axes", 1.02))
-        
-            # Calculate the middle value
-            phis_middle = (phis_left + phis_right) / 2
-        
-            # Calculate the grid interval
-            grid_interval = (phis_right - phis_left) / (grid_num_2 - 1)
-        
-            # Generate the list of x-axis tick positions
-            xtick_positions = [round(phis_left, 2), round(phis_middle, 2), round(phis_right, 2)]
-        
-            # Generate the list of grid positions
-            grid_positions = np.linspace(phis_left, phis_right, num=grid_num_2)
-        
-            # Set the x-axis ticks and labels
-            ax2.set_xticks(xtick_positions)
-            ax2.set_xticklabels([f"{x:.2f}" for x in xtick_positions])
-        
-            # Set the grid lines
-            ax2.set_xticks(grid_positions, minor=True)
-            ax2.grid(which='minor', linestyle='--', linewidth=0.5)
-        
-            # Major and minor grid lines
-            ax2.grid(which='major', color='silver', linestyle='-')
-            ax2.grid(which='minor', color='lightgrey', linestyle=':', axis='y')
-            ax2.xaxis.set_ticks_position("top")
-            ax2.xaxis.set_label_position("top")
-        
-            # Add a legend to distinguish different columns
-            ax2.legend()
-        
-        
-            # Subplot 3
-            ax3 = plt.subplot2grid((1, 3), (0, 2), rowspan=1, colspan=1)
-            
-            if mode == "Average":
-                for column in columns_to_plot:
-                    ax3.plot(las_df_revised['Average Porosity'], las_df_revised['Depth'], label="Max Value", color=dt_color)
-        
-            else:
-                # Select all columns in las_df_revised except "Depth" and "Sonic Log Reading"
-                columns_to_plot = [col for col in las_df_revised.columns if col not in ["Depth", "Sonic Log Reading"]]
-            
-                # Create an empty list to store the maximum values
-                max_values = []
-            
-                # Iterate over the rows in the DataFrame
-                for index, row in las_df_revised.iterrows():
-                    # Initialize the maximum value as negative infinity
-                    max_value = float('-inf')
-                    
-                    # Iterate over the columns you want to compare
-                    for column in columns_to_plot:
-                        # Get the value from the current column
-                        value = row[column]
-                        
-                        # Update the maximum value if the current value is greater
-                        if value > max_value:
-                            max_value = value
-                    
-                    # Append the maximum value to the list
-                    max_values.append(max_value)
-            
-                # Add the 'Max Value' column to the DataFrame and rename it
-                max_values_df = pd.DataFrame(max_values, columns=["Max Value"])
-            
-                # Now you can use 'Max Value' in the plot
-                ax3.plot(max_values_df['Max Value'], las_df_revised['Depth'], label="Max Value", color=dt_color)
-        
-                ##area-fill sand and shale for VSH
-            ax3.fill_betweenx(las_df_revised['Depth'], -0.15, 0, interpolate=False, color = 'orange', linewidth=0, alpha=0.5, hatch = '=-')
-            ax3.fill_betweenx(las_df_revised['Depth'], 0, 0.467, interpolate=False, color = 'green', linewidth=0, alpha=0.5, hatch = 'b')
-            ax3.fill_betweenx(las_df_revised['Depth'], 0.467, 1, interpolate=False, color = 'gold', linewidth=0, alpha=0.5, hatch = 'o')
-            ax3.fill_betweenx(las_df_revised['Depth'], 1, 1.51, interpolate=False, color = 'red', linewidth=0, alpha=0.5, hatch = 'x')
-        
-        
-            ax3.set_xlabel(trackname_3)
-            ax3.set_xlim(result_left, result_right)
-            ax3.set_ylim(bot_depth, top_depth)
-            ax3.xaxis.label.set_color(dt_color)
-            ax3.tick_params(axis='x', colors=dt_color)
-            ax3.spines["top"].set_edgecolor(dt_color)
-            ax3.spines["top"].set_position(("axes", 1.02))
-        
-            # Calculate the middle value
-            result_middle = (result_left + result_right) / 2
-        
-            # Calculate the grid interval
-            grid_interval = (result_right - result_left) / (grid_num_3 - 1)
-        
-            # Generate the list of x-axis tick positions
-            xtick_positions = [round(result_left, 2), round(result_middle, 2), round(result_right, 2)]
-        
-            # Generate the list of grid positions
-            grid_positions = np.linspace(result_left, result_right, num=grid_num_3)
-        
-            # Set the x-axis ticks and labels
-            ax3.set_xticks(xtick_positions)
-            ax3.set_xticklabels([f"{x:.2f}" for x in xtick_positions])
-        
-            # Set the grid lines
-            ax3.set_xticks(grid_positions, minor=True)
-            ax3.grid(which='minor', linestyle='--', linewidth=0.5)
-        
-            # Major and minor grid lines
-            ax3.grid(which='major', color='silver', linestyle='-')
-            ax3.grid(which='minor', color='lightgrey', linestyle=':', axis='y')
-            ax3.xaxis.set_ticks_position("top")
-            ax3.xaxis.set_label_position("top")
-            
-            pdf_filename = "visualization_figures.pdf"
-            pdf_pages = PdfPages(pdf_filename)
-    
-          
-            # Show the plot in Streamlit
             st.subheader('Log Visualization')
-            st.pyplot(fig)
-            pdf_pages.savefig(fig)
-            plt.close(fig)        
+            if viewer == 'Interactive (WebGL)':
+                # Only the level of detail fitting the depth window is sent to the browser
+                def pyramid(frame, column):
+                    return log_viewer.get_pyramid(data_inputs + (result_method, column), frame['Depth'], frame[column])
+                tracks = [
+                    [('Sonic Log Reading', pyramid(las_df_revised, 'Sonic Log Reading'), 'black')],
+                    [(column, pyramid(las_df_revised, column), None)
+                     for column in result_curves.porosity_columns(las_df_revised)],
+                    [(result_name, pyramid(result_df, result_name), 'black')],
+                ]
+                with profiler.stage("figure: interactive tracks"):
+                    st.plotly_chart(log_viewer.viewer_figure(tracks, plot_settings), use_container_width=True)
+            else:
+                # Tracks are sliced to the depth window and decimated to the track height
+                with profiler.stage("figure: log tracks"):
+                    fig_png = figure_cache.get_png(
+                        lru.inputs_key("tracks", *plot_inputs),
+                        lambda: log_plot.plot_log_tracks(las_df_revised, result_df, result_name, plot_settings,
+                                                         well.depth_index))
+                    st.image(fig_png, use_column_width=True)
             
             #Legend for Result
             st.markdown('''
@@ -678,66 +535,53 @@ if selected_menu == "Interpretation":
                          ''')
             
             st.subheader('Depth vs Sonic Porosity')
-            columns_to_plot = [col for col in las_df_revised.columns if col not in ["Depth", "Sonic Log Reading"]]
-        
-            # Create a figure and axis object
-            fig2, ax = plt.subplots(figsize=(plot_w_fig23, plot_h_fig23))
-        
-            # Plot the selected columns against 'Depth' in a line graph
-            for column in columns_to_plot:
-                ax.plot(las_df_revised['Depth'], las_df_revised[column], label=column)
-        
-            # Set labels and title
-            ax.set_xlabel('Depth')
-            ax.set_ylabel('Sonic Porosity')  # You can customize the label as needed
-            ax.set_title('')
-        
-            # Add a legend
-            ax.legend()
-        
-            # Show the plot
-            st.pyplot(fig2)
-            pdf_pages.savefig(fig2)
-            plt.close(fig2)
+            with profiler.stage("figure: depth vs porosity"):
+                fig2_png = figure_cache.get_png(
+                    lru.inputs_key("depth_porosity", *data_inputs),
+                    lambda: log_plot.plot_depth_porosity(las_df_revised))
+                st.image(fig2_png, use_column_width=True)
         
             st.subheader('Sonic Log Reading vs Sonic Porosity')
-            columns_to_plot = [col for col in las_df_revised.columns if col not in ["Depth", "Sonic Log Reading"]]
-        
-            # Create a figure and axis object
-            fig3, ax = plt.subplots(figsize=(plot_w_fig23, plot_h_fig23))
-        
-            # Plot the selected columns against 'Depth' in a line graph
-
-            for column in columns_to_plot:
-                ax.plot(las_df_revised['Sonic Log Reading'], las_df_revised[column], label=column)
+            with profiler.stage("figure: sonic vs porosity"):
+                fig3_png = figure_cache.get_png(
+                    lru.inputs_key("dt_porosity", *data_inputs),
+                    lambda: log_plot.plot_dt_porosity(las_df_revised))
+                st.image(fig3_png, use_column_width=True)
             
-            # Set labels and title
-            ax.set_xlabel('Sonic Log Reading')
-            ax.set_ylabel('Sonic Porosity')  # You can customize the label as needed
-            ax.set_title('')
-        
-            # Add a legend
-            ax.legend()
-        
-            # Show the plot
-            st.pyplot(fig3)
-            pdf_pages.savefig(fig3)
-            plt.close(fig3)
-            pdf_pages.close()
             
+            # Statistics of every porosity column over the depth window (constant-time row lookup)
+            st.subheader('Depth Window Statistics')
+            if not well.depth_index.monotonic:
+                st.info('Depth is not monotonic in this file; window statistics are not available.')
+            else:
+                with profiler.stage("window statistics"):
+                    starts, stops = well.depth_index.slices([top_depth], [bot_depth])
+                    window_columns = result_curves.porosity_columns(las_df_revised)
+                    window_values = [las_df_revised[column] for column in window_columns]
+                    if result_name not in window_columns:
+                        window_columns.append(result_name)
+                        window_values.append(result_df[result_name])
+                    window_stats = pd.concat(
+                        [result_curves.interval_statistics(values, starts, stops) for values in window_values])
+                    window_stats.index = window_columns
+                    st.dataframe(window_stats, use_container_width=True)
             
+            # The PDF is rendered in memory on request and cached on its inputs
             st.markdown('**Download Result:**')
-            with open(pdf_filename, "rb") as pdf_file:
-                st.download_button("Download", pdf_file.read(), key="pdf_button", mime="application/pdf")
+            pdf_key = lru.inputs_key("report", *plot_inputs)
+            if st.button("Prepare PDF", key="pdf_prepare"):
+                st.session_state["pdf_key"] = pdf_key
+            if st.session_state.get("pdf_key") == pdf_key:
+                with profiler.stage("PDF report"):
+                    pdf_bytes = report.get_report(
+                        pdf_key, las_df_revised, result_df, result_name, plot_settings, well.depth_index)
+                st.download_button("Download", pdf_bytes, file_name="visualization_figures.pdf",
+                                   key="pdf_button", mime="application/pdf")
 
-        if data == [] or selected_column == "DEPTH":
+        if las_df_revised.empty or selected_column == "DEPTH":
             st.warning('Please select other curve data.')
         else:
             formeval_mode = st.sidebar.checkbox("Formation Evaluation")
-            need_calibration = False
-            have_anomaly = False
-            need_correction = False
-            no_error = False
         
             def result_calibration():
                 st.markdown('''**Negative porosity value. Porosity should range between 0 to 1.**
@@ -769,26 +613,34 @@ if selected_menu == "Interpretation":
             if formeval_mode:
               st.divider()
               st.subheader('Findings:')
-              for max_value in max_values_df['Max Value']:
-                  if max_value < 0 and not need_calibration:
-                      need_calibration = True
-                      no_error = False
-                      result_calibration()
-
-                  if max_value > 1 and not have_anomaly:
-                      have_anomaly = True
-                      no_error = False
-                      result_anomaly()
+              min_thickness = st.sidebar.number_input(
+                  "Minimum Zone Thickness:", min_value=0.00, value=zonation.MIN_THICKNESS, step=1.0)
+              with profiler.stage("formation evaluation"):
+                  # Every sample is classified and run-length encoded into zones;
+                  # thinner zones are merged into their neighbours
+                  zones = zonation.zone_table(
+                      result_df["Depth"].to_numpy(), result_df[result_name].to_numpy(), min_thickness)
+                  # Findings from every sample, so thin problem intervals are still reported
+                  findings = zonation.findings(result_df[result_name].to_numpy())
+              messages = {
+                  "Negative": result_calibration,
+                  "Anomaly": result_anomaly,
+                  "Overestimate": result_correction,
+                  "Normal": result_good,
+              }
+              for finding in findings:
+                  messages[finding]()
+              st.markdown('**Zones:**')
+              st.dataframe(zones, use_container_width=True)
+              st.download_button("Download Zones (CSV)", zones.to_csv(index=False),
+                                 file_name="zones.csv", mime="text/csv", key="zones_csv")
 
-                  if 0.467 < max_value < 1 and not need_correction:
-                      need_correction = True
-                      no_error = False
-                      result_correction()
-
-                  if 0 < max_value < 0.467 and not need_calibration and not have_anomaly and not need_correction and not no_error:
-                      no_error = True
-                      need_calibration = False
-                      have_anomaly = False
-                      need_correction = False
-                      result_good()
-                      break
+    # Breakdown of this rerun and the CSV history, when profiling is on
+    if profiler.enabled:
+        st.divider()
+        with st.expander("Performance of this rerun", expanded=True):
+            stages = profiler.last_rerun()
+            st.plotly_chart(instrument.stage_chart(stages), use_container_width=True)
+            st.dataframe(stages.drop(columns=["Rerun", "Started"]).round(2), use_container_width=True)
+            st.download_button("Export history (CSV)", profiler.history_frame().to_csv(index=False),
+                               file_name="rerun_profile.csv", mime="text/csv", key="profile_csv")
@@ -0,0 +1,176 @@
+"""
+Display-size variants of the static images of the informational pages.
+
+The figures, the About photo and the 31 User's Guide pages are shipped at
+full resolution (the manual alone is over 55 MB). Each image is resized and
+re-encoded once per source version (path, mtime and size) and requested
+size; the variant is written to a disk cache and kept in an in-memory LRU
+cache, so pages send small images and never touch Pillow on a rerun.
+
+Variants are what ``st.image`` passes through untouched: JPEG (PNG only for
+images with transparency) and at most MAX_WIDTH pixels wide. Any other
+format or a wider image is decoded and re-encoded by Streamlit on every
+rerun.
+
+    python -m assets    # generate every variant ahead of time
+"""
+import glob
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+
+from lru import LRUCache
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sonic-log-interpreter", "assets")
+
+# Widest image st.image sends as is (Streamlit's MAXIMUM_CONTENT_WIDTH)
+MAX_WIDTH = 1460
+
+# Display widths (px)
+PAGE_WIDTH = 1400
+PHOTO_WIDTH = MAX_WIDTH
+THUMB_WIDTH = 160
+
+QUALITY = 82
+
+# Bounds of the in-memory variant cache
+MAX_ENTRIES = 128
+MAX_BYTES = 64 * 1024 * 1024
+
+asset_cache = LRUCache(MAX_ENTRIES, MAX_BYTES)
+
+
+def cache_dir():
+    """Return the disk cache directory ($SONIC_ASSET_CACHE; empty disables it)."""
+    path = os.environ.get("SONIC_ASSET_CACHE", DEFAULT_CACHE_DIR)
+    return path or None
+
+
+def image_format(path):
+    # PNG sources may carry transparency; everything else is served as JPEG
+    return "PNG" if path.lower().endswith(".png") else "JPEG"
+
+
+def _path(name):
+    return name if os.path.isabs(name) else os.path.join(ASSET_DIR, name)
+
+
+def variant_key(path, width=None, divide=None, fmt="JPEG"):
+    """Cache key of a variant: the source version plus the requested size and format."""
+    stat = os.stat(path)
+    spec = repr((os.path.abspath(path), stat.st_mtime_ns, stat.st_size, width, divide, fmt, QUALITY))
+    return hashlib.blake2b(spec.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def render_variant(path, width=None, divide=None, fmt="JPEG"):
+    """
+    Resize and encode one image. ``width`` scales to that width keeping the
+    aspect ratio (never enlarging); ``divide=(dx, dy)`` divides each side.
+    The result is never wider than MAX_WIDTH, and a PNG without (or with a
+    fully opaque) alpha channel is encoded as JPEG, as st.image would do on
+    every rerun.
+    """
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if divide is not None:
+            size = (int(image.width / divide[0]), int(image.height / divide[1]))
+        elif width is not None and image.width > width:
+            size = (width, round(image.height * width / image.width))
+        else:
+            size = image.size
+        if size[0] > MAX_WIDTH:
+            size = (MAX_WIDTH, round(size[1] * MAX_WIDTH / size[0]))
+        image = image.resize(size, Image.LANCZOS) if size != image.size else image.copy()
+    if image.mode in ("RGBA", "LA") and image.getchannel("A").getextrema() == (255, 255):
+        # An alpha channel that is fully opaque is dropped
+        image = image.convert("RGB" if image.mode == "RGBA" else "L")
+    if fmt == "PNG" and image.mode not in ("RGBA", "LA", "P"):
+        fmt = "JPEG"
+    if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, quality=QUALITY)
+    return buffer.getvalue()
+
+
+def _read_disk(key):
+    root = cache_dir()
+    if root is None:
+        return None
+    try:
+        with open(os.path.join(root, key), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_disk(key, data):
+    root = cache_dir()
+    if root is None:
+        return
+    try:
+        os.makedirs(root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=root, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(root, key))
+    except OSError:
+        pass
+
+
+def get_image(name, width=None, divide=None):
+    """Return the encoded display variant of an asset: memory, then disk, then render."""
+    path = _path(name)
+    fmt = image_format(path)
+    key = variant_key(path, width, divide, fmt)
+
+    def load():
+        data = _read_disk(key)
+        if data is None:
+            data = render_variant(path, width, divide, fmt)
+            _write_disk(key, data)
+        return data
+    return asset_cache.get_or_compute(key, load)
+
+
+def manual_pages():
+    """Return the User's Guide page images in page order."""
+    return sorted(glob.glob(os.path.join(ASSET_DIR, "Manual_page-*.jpg")))
+
+
+def page(index):
+    return get_image(manual_pages()[index], width=PAGE_WIDTH)
+
+
+def thumbnail(index):
+    return get_image(manual_pages()[index], width=THUMB_WIDTH)
+
+
+# Variants used by the informational pages: (file, width, divide)
+FIGURES = [
+    ("About_us.jpg", PHOTO_WIDTH, None),
+    ("Sonic_Formula.png", None, (3, 3.5)),
+    ("Transit_Time.png", None, (3, 3.5)),
+    ("Correction.png", None, (3, 3.5)),
+    ("Curves_Abbrv.png", None, (1.5, 1.5)),
+]
+
+
+def main():
+    total_source = total_variant = 0
+    jobs = [(name, width, divide) for name, width, divide in FIGURES]
+    jobs += [(path, width, None) for path in manual_pages() for width in (PAGE_WIDTH, THUMB_WIDTH)]
+    for name, width, divide in jobs:
+        data = get_image(name, width, divide)
+        total_variant += len(data)
+        if width != THUMB_WIDTH:
+            total_source += os.path.getsize(_path(name))
+    print(f"{len(jobs)} variants in {cache_dir()}: {total_source / 1e6:.1f} MB of sources, "
+          f"{total_variant / 1e6:.1f} MB of variants")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Batch multi-well interpretation.
+
+Runs the same matrix/fluid/correction setup over many LAS files across a
+process pool and returns a per-well summary table, one porosity result file
+per well and the throughput in wells/sec and samples/sec.
+
+    python batch.py LAS_1.las LAS_2.las ... [--out results] [--workers 4]
+    python batch.py path/to/field_archive --models Sandstone:Seawater --correction "Oil Correction"
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import pipeline
+
+
+def collect_las_paths(inputs):
+    """Expand files and directories into the sorted list of LAS files to process."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if name.lower().endswith(".las"):
+                    paths.append(os.path.join(item, name))
+        else:
+            paths.append(item)
+    return paths
+
+
+def process_well(name, source, spec, out_dir=None):
+    """
+    Interpret one well with the headless pipeline.
+
+    Returns ``(summary, csv_bytes)``. The result table is written to
+    ``out_dir`` when given (and ``csv_bytes`` is None), otherwise it is
+    returned as CSV bytes. Errors are reported in the summary.
+    """
+    start = time.perf_counter()
+    summary = {"File": name}
+    try:
+        result = pipeline.run(source, spec)
+        summary.update(pipeline.summarize(result))
+
+        csv_bytes = result.frame.to_csv(index=False).encode("utf-8")
+        if out_dir is not None:
+            stem = os.path.splitext(os.path.basename(name))[0]
+            output = os.path.join(out_dir, f"{stem}_sonic_porosity.csv")
+            with open(output, "wb") as f:
+                f.write(csv_bytes)
+            summary["Output"] = output
+            csv_bytes = None
+        summary["Error"] = ""
+    except Exception as e:
+        csv_bytes = None
+        summary["Error"] = f"{type(e).__name__}: {e}"
+    summary["Seconds"] = time.perf_counter() - start
+    return summary, csv_bytes
+
+
+def run_batch(sources, spec, out_dir=None, workers=None, mp_context=None):
+    """
+    Interpret many wells across a process pool.
+
+    ``sources`` is a list of ``(name, path_or_bytes)``. Returns
+    ``(summary_df, results, stats)`` where ``results`` maps each file name
+    to its CSV bytes (empty when written to ``out_dir``) and ``stats``
+    holds the wall time and the throughput.
+    """
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    if workers == 1 or len(sources) <= 1:
+        outputs = [process_well(name, source, spec, out_dir) for name, source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            futures = [pool.submit(process_well, name, source, spec, out_dir)
+                       for name, source in sources]
+            outputs = [future.result() for future in futures]
+    seconds = time.perf_counter() - start
+
+    summary_df = pd.DataFrame([summary for summary, _ in outputs])
+    results = {summary["File"]: csv for summary, csv in outputs if csv is not None}
+    samples = int(summary_df["Samples"].fillna(0).sum()) if "Samples" in summary_df else 0
+    stats = {
+        "wells": len(sources),
+        "samples": samples,
+        "seconds": seconds,
+        "wells_per_sec": len(sources) / seconds if seconds else float("inf"),
+        "samples_per_sec": samples / seconds if seconds else float("inf"),
+    }
+    return summary_df, results, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch sonic porosity interpretation of many LAS files.")
+    parser.add_argument("inputs", nargs="+", help="LAS files or directories of LAS files")
+    pipeline.add_spec_arguments(parser)
+    parser.add_argument("--out", default="batch_results", help="directory for the result files")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPUs)")
+    args = parser.parse_args(argv)
+
+    spec = pipeline.spec_from_args(args)
+    paths = collect_las_paths(args.inputs)
+    summary_df, _, stats = run_batch(
+        [(path, path) for path in paths], spec, out_dir=args.out, workers=args.workers)
+
+    summary_path = os.path.join(args.out, "summary.csv")
+    summary_df.to_csv(summary_path, index=False)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(summary_df.drop(columns=["Output"], errors="ignore").to_string(index=False))
+    print(f"\n{stats['wells']} wells, {stats['samples']} samples in {stats['seconds']:.2f} s "
+          f"({stats['wells_per_sec']:.1f} wells/sec, {stats['samples_per_sec']:.0f} samples/sec)")
+    print(f"Summary written to {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
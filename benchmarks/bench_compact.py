@@ -0,0 +1,73 @@
+"""
+Measure the memory held by the Interpretation tab for one well, in the
+default float64 mode and in the compact mode (float32 curves, implicit
+regular depth, frames sharing the node arrays).
+
+    python -m benchmarks.bench_compact [--scales 1 10] [--file Sample.las]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import column_graph
+import las_loader
+import pipeline
+import porosity
+from benchmarks.common import LAS_FILES, scaled_las_file
+
+
+def footprint(load):
+    """
+    Return the bytes the well returned by ``load()`` retains (measured, with
+    whatever it keeps of the lasio file), then the bytes still allocated once
+    a rerun has built everything it keeps: its data frame, the six-model
+    data set with average and the Max result curve.
+    """
+    column_graph.column_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        well = load()
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        curve = well.sonic_curve() or list(well.columns)[1]
+        las_df = well.df()
+        graph = column_graph.PorosityGraph(
+            well, curve, porosity.MODELS, unit=pipeline.detect_unit(well.curve_unit(curve)), average=True)
+        kept = (las_df, graph.frame(), graph.result_frame("Max"))
+        rerun = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    column_graph.column_cache.clear()
+    return before - start, rerun
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--file", nargs="+", default=LAS_FILES)
+    args = parser.parse_args()
+
+    print(f"{'file':<12}{'scale':>6}{'samples':>10}{'well [MB]':>12}{'rerun [MB]':>12}"
+          f"{'compact well':>14}{'compact rerun':>15}{'reduction':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SONIC_WELL_CACHE"] = ""
+        for path in args.file:
+            for scale in args.scales:
+                scaled = os.path.join(tmp, f"x{scale}_{os.path.basename(path)}")
+                scaled_las_file(path, scaled, scale)
+                samples = len(las_loader.parse_las_path(scaled))
+                full = footprint(lambda: las_loader.parse_las_path(scaled))
+                compact = footprint(lambda: las_loader.CompactWell(las_loader.parse_las_path(scaled)))
+                reduction = 1 - sum(compact) / sum(full)
+                print(f"{path:<12}{scale:>6}{samples:>10}{full[0] / 1e6:>12.2f}{full[1] / 1e6:>12.2f}"
+                      f"{compact[0] / 1e6:>14.2f}{compact[1] / 1e6:>15.2f}{reduction:>10.0%}", flush=True)
+                os.remove(scaled)
+
+
+if __name__ == "__main__":
+    main()
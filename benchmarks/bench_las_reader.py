@@ -0,0 +1,69 @@
+"""
+Benchmark the chunked ~A reader and the memory-mapped well store reload
+against lasio.read + df() on the bundled LAS files scaled up synthetically.
+
+    python -m benchmarks.bench_las_reader [--scales 1 10 100] [--file Sample.las]
+"""
+import argparse
+import os
+import tempfile
+
+import lasio
+
+import las_loader
+import las_reader
+from benchmarks.common import LAS_FILES, best_of, peak_memory, scaled_las_file
+
+
+def read_lasio(path):
+    las_file = lasio.read(path)
+    return las_file.df()
+
+
+def read_chunked(path):
+    return las_reader.read_las_chunked(path)
+
+
+def stream_blocks(path):
+    # Constant-memory mode: reduce each block without keeping it
+    rows = 0
+    for _, block in las_reader.iter_data_blocks(path):
+        rows += len(block)
+    return rows
+
+
+def reload_store(path):
+    # Hash the file and map its stored columns, as a cache miss in the app does
+    return las_loader.restore_well(las_loader.content_key_path(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--file", nargs="+", default=LAS_FILES)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    readers = [("lasio", read_lasio), ("chunked", read_chunked), ("stream", stream_blocks),
+               ("store", reload_store)]
+    print(f"{'file':<12}{'scale':>6}{'MB':>8}" + "".join(
+        f"{name + ' [s]':>14}{name + ' [MB]':>14}" for name, _ in readers))
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SONIC_WELL_CACHE"] = os.path.join(tmp, "wells")
+        for path in args.file:
+            for scale in args.scales:
+                scaled = os.path.join(tmp, f"x{scale}_{os.path.basename(path)}")
+                scaled_las_file(path, scaled, scale)
+                size = os.path.getsize(scaled) / 1e6
+                las_loader.store_well(las_loader.parse_las_path(scaled), scaled)
+                line = f"{path:<12}{scale:>6}{size:>8.1f}"
+                for _, reader in readers:
+                    seconds, _ = best_of(lambda: reader(scaled), args.repeat)
+                    peak = peak_memory(lambda: reader(scaled)) / 1e6
+                    line += f"{seconds:>14.3f}{peak:>14.1f}"
+                print(line, flush=True)
+                os.remove(scaled)
+
+
+if __name__ == "__main__":
+    main()
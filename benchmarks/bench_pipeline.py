@@ -0,0 +1,62 @@
+"""
+Benchmark the headless pipeline: cold import time in a fresh interpreter
+(and a check that no UI module is imported), then the time of each stage
+on the bundled LAS files, with the sonic QC and, for wells with a gamma-ray
+curve, the compaction correction.
+
+    python -m benchmarks.bench_pipeline [--repeat N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import compaction
+import pipeline
+from benchmarks.common import LAS_FILES
+
+# Modules the headless pipeline must not import
+UI_MODULES = ("streamlit", "matplotlib", "missingno", "lascheck")
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import pipeline
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (UI_MODULES,)
+
+
+def cold_import():
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    imports = [cold_import() for _ in range(args.repeat)]
+    print(f"cold import of pipeline: {min(i['seconds'] for i in imports) * 1000:.1f} ms")
+    print(f"UI modules imported: {imports[0]['loaded'] or 'none'}\n")
+
+    stages = ["load", "unit", "qc", "compaction", "porosity", "result", "evaluation"]
+    print(f"{'file':<12}{'samples':>9}" + "".join(f"{stage + ' [ms]':>17}" for stage in stages))
+    for path in LAS_FILES:
+        # Compaction needs a gamma-ray curve (LAS_4 has none)
+        spec = pipeline.InterpretationSpec(
+            compaction=compaction.gamma_ray_curve(pipeline.load(path)) is not None)
+        best = {}
+        for _ in range(args.repeat):
+            result = pipeline.run(path, spec)
+            for stage in stages:
+                if stage in result.timings:
+                    best[stage] = min(best.get(stage, float("inf")), result.timings[stage])
+        print(f"{path:<12}{len(result.frame):>9}" +
+              "".join(f"{best[stage] * 1000:>17.2f}" if stage in best else f"{'-':>17}" for stage in stages))
+
+
+if __name__ == "__main__":
+    main()
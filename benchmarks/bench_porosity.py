@@ -0,0 +1,61 @@
+"""
+Benchmark the vectorized porosity engine against the per-row dict loop
+that used to live in the Log Visualization tab.
+
+    python -m benchmarks.bench_porosity [--repeat N] [--scale N]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import las_loader
+import porosity
+from benchmarks.common import LAS_FILES, best_of, load_las_df
+
+
+def legacy_porosity_loop(depths, dt_values, models, correction, unit):
+    # Reproduction of the original loop: one dict per depth sample
+    matrix, fluid = porosity.transit_times(unit)
+    factor = porosity.HC_CORRECTION[correction]
+    data = []
+    for depth, dt_log in zip(depths, dt_values):
+        row_data = {"Depth": depth, "Sonic Log Reading": dt_log}
+        for m, f in models:
+            phi = (dt_log - matrix[m]) / (fluid[f] - matrix[m])
+            row_data[porosity.column_name(m, f)] = phi * factor if factor != 1.0 else phi
+        data.append(row_data)
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=int, default=1,
+                        help="tile each curve N times to emulate longer logs")
+    args = parser.parse_args()
+
+    models = porosity.MODELS
+    print(f"{'file':<12}{'samples':>10}{'loop [s]':>12}{'engine [s]':>12}{'speedup':>10}")
+    for path in LAS_FILES:
+        _, las_df = load_las_df(path)
+        # The sonic curve the app would pick, else the first data curve
+        well = las_loader.parse_las_path(path)
+        curve = well.sonic_curve() or list(well.columns)[1]
+        depths = np.tile(las_df["DEPTH"].to_numpy(), args.scale)
+        dt = np.tile(las_df[curve].to_numpy(), args.scale)
+
+        loop_time, expected = best_of(
+            lambda: legacy_porosity_loop(depths, dt, models, "Oil Correction", "US/FT"),
+            args.repeat)
+        engine_time, frame = best_of(
+            lambda: porosity.porosity_frame(depths, dt, models, "Oil Correction", "US/FT"),
+            args.repeat)
+
+        pd.testing.assert_frame_equal(expected, frame, check_exact=False)
+        print(f"{path:<12}{len(dt):>10}{loop_time:>12.4f}{engine_time:>12.4f}"
+              f"{loop_time / engine_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the cycle-skip / spike detection of the sonic curve: the strided
+rolling median/MAD of sonic_qc against a per-sample Python loop computing
+the same statistics, on Sample.las and the LWD files (LAS_1 to LAS_3) and
+synthetically scaled copies of them.
+
+    python -m benchmarks.bench_sonic_qc [--scales 1 10] [--file Sample.las] [--loop-limit 20000]
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+import las_loader
+import pipeline
+import sonic_qc
+from benchmarks.common import best_of, scaled_las_file
+
+# Sample.las (wireline) and the LWD runs (ARC / sonic while drilling)
+QC_FILES = ["Sample.las", "LAS_1.las", "LAS_2.las", "LAS_3.las"]
+
+
+def loop_median_mad(values, window=sonic_qc.WINDOW):
+    # Reference: one nanmedian pair per sample
+    half = window // 2
+    median = np.full(len(values), np.nan)
+    mad = np.full(len(values), np.nan)
+    for i in range(len(values)):
+        chunk = values[max(i - half, 0):i + half + 1]
+        chunk = chunk[~np.isnan(chunk)]
+        if len(chunk):
+            median[i] = np.median(chunk)
+            mad[i] = np.median(np.abs(chunk - median[i]))
+    return median, mad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--file", nargs="+", default=QC_FILES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--loop-limit", type=int, default=20000,
+                        help="skip the loop reference above this many samples")
+    args = parser.parse_args()
+
+    print(f"{'file':<12}{'scale':>6}{'samples':>10}{'flagged':>9}{'intervals':>11}"
+          f"{'vectorized [ms]':>17}{'loop [ms]':>12}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SONIC_WELL_CACHE"] = ""
+        for path in args.file:
+            for scale in args.scales:
+                scaled = path
+                if scale != 1:
+                    scaled = os.path.join(tmp, f"x{scale}_{os.path.basename(path)}")
+                    scaled_las_file(path, scaled, scale)
+                well = las_loader.parse_las_path(scaled)
+                curve = well.sonic_curve() or list(well.columns)[1]
+                unit = pipeline.detect_unit(well.curve_unit(curve))
+                dt = well.columns[curve]
+
+                seconds, (flags, median) = best_of(lambda: sonic_qc.detect(dt, unit=unit), args.repeat)
+                intervals = sonic_qc.flagged_intervals(well.columns["DEPTH"], dt, flags, median)
+                loop = speedup = ""
+                if len(dt) <= args.loop_limit:
+                    loop_seconds, (loop_med, _) = best_of(lambda: loop_median_mad(dt), 1)
+                    assert np.allclose(median, loop_med, equal_nan=True)
+                    loop = f"{loop_seconds * 1000:.1f}"
+                    speedup = f"{loop_seconds / seconds:.0f}x"
+                print(f"{path:<12}{scale:>6}{len(dt):>10}{int(np.count_nonzero(flags)):>9}{len(intervals):>11}"
+                      f"{seconds * 1000:>17.2f}{loop:>12}{speedup:>9}", flush=True)
+                if scaled != path:
+                    os.remove(scaled)
+
+
+if __name__ == "__main__":
+    main()
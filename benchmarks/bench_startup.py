@@ -0,0 +1,89 @@
+"""
+Startup benchmark: cold start of the Home page and the cold import cost of
+every module the Interpretation page loads lazily.
+
+The app script is executed in a fresh interpreter in Streamlit's bare mode
+(no server; widgets return their defaults, so the Home page is rendered).
+The time beyond ``import streamlit`` is checked against a budget, and none
+of the deferred modules may be imported by the Home page.
+
+    python -m benchmarks.bench_startup [--repeat N] [--budget-ms 300]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Imported only by the Interpretation page or one of its sub-tabs
+DEFERRED_MODULES = (
+    "lasio", "lascheck", "missingno", "matplotlib", "plotly",
+    "las_loader", "conformity", "coverage", "figure_cache", "log_plot",
+    "log_viewer", "report", "batch", "pipeline", "column_graph", "compaction",
+    "zonation", "sonic_qc",
+)
+
+# Modules whose cold import is reported on its own
+IMPORT_COSTS = (
+    "pandas", "lasio", "lascheck", "matplotlib.pyplot", "plotly.graph_objects", "missingno",
+    "las_loader", "conformity", "coverage", "log_plot", "log_viewer", "report", "batch",
+)
+
+STREAMLIT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import streamlit
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+HOME_SCRIPT = """
+import json, logging, runpy, sys, time
+start = time.perf_counter()
+import streamlit
+imported = time.perf_counter()
+logging.disable(logging.WARNING)  # bare-mode warnings of every st.* call
+runpy.run_path("SonicApp.py", run_name="__main__")
+end = time.perf_counter()
+print(json.dumps({"streamlit": imported - start, "app": end - imported,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+IMPORT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import %s
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+
+def run_script(script):
+    output = subprocess.run([sys.executable, "-c", script],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=300.0,
+                        help="time allowed for the Home page beyond importing streamlit")
+    args = parser.parse_args()
+
+    print(f"{'module':<24}{'cold import [ms]':>18}")
+    for module in IMPORT_COSTS:
+        seconds = min(run_script(IMPORT_SCRIPT % module)["seconds"] for _ in range(args.repeat))
+        print(f"{module:<24}{seconds * 1000:>18.1f}")
+
+    baseline = min(run_script(STREAMLIT_SCRIPT)["seconds"] for _ in range(args.repeat))
+    runs = [run_script(HOME_SCRIPT) for _ in range(args.repeat)]
+    app = min(run["app"] for run in runs)
+    loaded = runs[0]["loaded"]
+    print(f"\nimport streamlit: {baseline * 1000:.1f} ms")
+    print(f"Home page beyond streamlit: {app * 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"deferred modules imported by the Home page: {loaded or 'none'}")
+
+    if app * 1000 > args.budget_ms or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark every stage of the app headlessly on the bundled LAS files and
+synthetically scaled copies of them, and save the timings and peak memory
+as JSON so runs can be compared across versions.
+
+    python -m benchmarks.bench_suite [--scales 1 10 100] [--file Sample.las]
+                                     [--stages ingest porosity ...] [--output results.json]
+                                     [--compare previous.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+
+import lasio
+import matplotlib.pyplot as plt
+import missingno as ms
+import numpy as np
+import pandas as pd
+
+import conformity
+import coverage
+import figure_cache
+import las_loader
+import log_plot
+import pipeline
+import porosity
+import report
+import result_curves
+import sonic_qc
+import zonation
+from benchmarks.common import LAS_FILES, best_of, las_dataframe, peak_memory, scaled_las_file
+
+# Stages in pipeline order
+STAGES = [
+    "lasio_read", "lasio_df", "ingest", "frame", "sonic_qc", "porosity", "result", "zonation",
+    "fig_tracks", "fig_depth_porosity", "fig_dt_porosity", "pdf",
+    "missingno", "coverage", "lascheck",
+]
+
+RESULT_METHOD = "Max"
+
+
+def missingno_png(las_df):
+    # The full-resolution matrix the Curve Data Overview used to draw
+    return figure_cache.render_png(lambda: ms.matrix(las_df, sparkline=False, labels=100).figure)
+
+
+def stage_functions(path):
+    """
+    Return ``{stage: func}`` for one LAS file. The inputs of every stage are
+    prepared here, untimed, so each stage is measured on its own.
+    """
+    las_file = lasio.read(path)
+    well = las_loader.parse_las_path(path)
+    las_df = well.df()
+    curve = well.sonic_curve() or list(well.columns)[1]
+    unit = pipeline.detect_unit(well.curve_unit(curve))
+    frame = porosity.porosity_frame(
+        las_df["DEPTH"], las_df[curve], porosity.MODELS, correction="None", unit=unit, average=True)
+    result_df = result_curves.result_frame(frame, RESULT_METHOD)
+    result_name = result_curves.result_name(RESULT_METHOD)
+    settings = {
+        "unit_curve": well.curve_unit(curve),
+        "top_depth": float(np.nanmin(well.columns["DEPTH"])),
+        "bot_depth": float(np.nanmax(well.columns["DEPTH"])),
+        "dt_left": 140.0, "dt_right": 40.0, "grid_num_1": 10,
+        "phis_left": 0.5, "phis_right": -0.15, "grid_num_2": 10,
+        "result_left": 1.15, "result_right": -0.15, "grid_num_3": 10,
+    }
+    return {
+        "lasio_read": lambda: lasio.read(path),
+        "lasio_df": lambda: las_dataframe(las_file),
+        "ingest": lambda: las_loader.parse_las_path(path),
+        "frame": well.df,
+        "sonic_qc": lambda: sonic_qc.detect(las_df[curve], unit=unit),
+        "porosity": lambda: porosity.porosity_frame(
+            las_df["DEPTH"], las_df[curve], porosity.MODELS, correction="None", unit=unit, average=True),
+        "result": lambda: result_curves.result_frame(frame, RESULT_METHOD),
+        "zonation": lambda: zonation.zone_table(result_df["Depth"], result_df[result_name]),
+        "fig_tracks": lambda: figure_cache.render_png(
+            lambda: log_plot.plot_log_tracks(frame, result_df, result_name, settings)),
+        "fig_depth_porosity": lambda: figure_cache.render_png(lambda: log_plot.plot_depth_porosity(frame)),
+        "fig_dt_porosity": lambda: figure_cache.render_png(lambda: log_plot.plot_dt_porosity(frame)),
+        "pdf": lambda: report.render_report(frame, result_df, result_name, settings),
+        "missingno": lambda: missingno_png(las_df),
+        "coverage": lambda: figure_cache.render_png(
+            lambda: coverage.plot_coverage(well.columns["DEPTH"], well.null_runs)),
+        "lascheck": lambda: conformity.run_check(path),
+    }
+
+
+def environment():
+    """Versions and revision the results were measured with."""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "lasio": lasio.__version__,
+    }
+
+
+def run(files, scales, stages, repeat=3, memory=True):
+    """Return one record per (file, scale, stage)."""
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in files:
+            for scale in scales:
+                scaled = path
+                if scale != 1:
+                    scaled = os.path.join(tmp, f"x{scale}_{os.path.basename(path)}")
+                    scaled_las_file(path, scaled, scale)
+                functions = stage_functions(scaled)
+                samples = len(las_loader.parse_las_path(scaled))
+                size_mb = os.path.getsize(scaled) / 1e6
+                for stage in stages:
+                    seconds, _ = best_of(functions[stage], repeat)
+                    peak_mb = peak_memory(functions[stage]) / 1e6 if memory else None
+                    records.append({
+                        "file": path, "scale": scale, "samples": samples, "size_mb": round(size_mb, 3),
+                        "stage": stage, "seconds": seconds, "peak_mb": peak_mb,
+                    })
+                    print(f"{path:<12}{scale:>6}{samples:>10}  {stage:<20}{seconds * 1000:>12.2f} ms"
+                          + (f"{peak_mb:>12.1f} MB" if memory else ""), flush=True)
+                    plt.close("all")
+                if scaled != path:
+                    os.remove(scaled)
+    return records
+
+
+def compare(records, previous):
+    """Print the ratio of each stage time to the same stage in a previous run."""
+    before = {(r["file"], r["scale"], r["stage"]): r["seconds"] for r in previous["results"]}
+    print(f"\n{'file':<12}{'scale':>6}  {'stage':<20}{'before [ms]':>14}{'now [ms]':>12}{'speedup':>10}")
+    for record in records:
+        old = before.get((record["file"], record["scale"], record["stage"]))
+        if old is None:
+            continue
+        print(f"{record['file']:<12}{record['scale']:>6}  {record['stage']:<20}"
+              f"{old * 1000:>14.2f}{record['seconds'] * 1000:>12.2f}{old / record['seconds']:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--file", nargs="+", default=LAS_FILES)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    records = run(args.file, args.scales, args.stages, args.repeat, not args.no_memory)
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": records}, f, indent=2)
+    print(f"\nResults written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(records, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
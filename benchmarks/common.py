@@ -0,0 +1,73 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run the benchmarks from the repository root, e.g.
+``python -m benchmarks.bench_porosity``.
+"""
+import time
+import tracemalloc
+
+import lasio
+import numpy as np
+
+import las_reader
+
+# LAS files bundled with the app
+LAS_FILES = ["Sample.las", "LAS_1.las", "LAS_2.las", "LAS_3.las", "LAS_4.las"]
+
+
+def las_dataframe(las_file):
+    """lasio's df() with DEPTH as the first column, as the app used to build on every rerun."""
+    las_df = las_file.df()
+    las_df.insert(0, "DEPTH", las_df.index)
+    las_df.reset_index(drop=True, inplace=True)
+    return las_df
+
+
+def load_las_df(path):
+    """Read a LAS file the way the app does, with DEPTH as the first column."""
+    las_file = lasio.read(path)
+    return las_file, las_dataframe(las_file)
+
+
+def best_of(func, repeat=5):
+    """Run ``func`` ``repeat`` times and return (best seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(func):
+    """Return the peak bytes allocated (traced by tracemalloc) while running ``func``."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scaled_las_file(path, out_path, scale):
+    """
+    Write a copy of a LAS file with its ~A section repeated ``scale`` times.
+
+    Depth keeps increasing by the sampling step so the result is a valid,
+    regularly sampled log ``scale`` times longer than the original.
+    """
+    with open(path, "rb") as f:
+        header, _, _ = f.read().partition(b"~A")
+    las_file = las_reader.read_las_chunked(path)
+    data = np.column_stack([curve.data for curve in las_file.curves])
+    depth = data[:, 0]
+    step = np.median(np.diff(depth)) if len(depth) > 1 else 1.0
+
+    with open(out_path, "wb") as out:
+        out.write(header + b"~A\n")
+        for i in range(scale):
+            block = data.copy()
+            block[:, 0] = depth + i * step * len(depth)
+            np.savetxt(out, block, fmt="%.4f")
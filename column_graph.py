@@ -0,0 +1,178 @@
+"""
+Dependency-tracked computation graph of the Interpretation data set.
+
+Every derived column is a node: an operation, its parameters and its input
+nodes. The key of a node hashes all three (input nodes by their own keys),
+so it changes exactly when something upstream changes, and node values are
+kept in an LRU cache shared by all sessions. Ticking one more porosity
+model creates one new column node plus new average/result/frame nodes; the
+columns of the other models are cache hits and are not recomputed.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import compaction
+import lru
+import porosity
+import result_curves
+import sonic_qc
+
+# Bounds of the shared column cache
+MAX_ENTRIES = 256
+MAX_BYTES = 512 * 1024 * 1024
+
+
+def _sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    return value.nbytes
+
+
+column_cache = lru.LRUCache(MAX_ENTRIES, MAX_BYTES, sizeof=_sizeof)
+
+
+class Node:
+    """
+    A value computed by ``compute(*input values)``, cached on a key derived
+    from ``op``, ``params`` and the keys of its inputs.
+    """
+
+    def __init__(self, op, params, inputs, compute, cached=True):
+        self.op = op
+        self.inputs = list(inputs)
+        self.key = lru.inputs_key(op, params, tuple(node.key for node in self.inputs))
+        self._compute = compute
+        self._cached = cached
+
+    def _evaluate(self):
+        value = self._compute(*[node.value() for node in self.inputs])
+        if isinstance(value, np.ndarray):
+            # Cached arrays are shared between sessions
+            value.flags.writeable = False
+        return value
+
+    def value(self):
+        if not self._cached:
+            return self._compute()
+        return column_cache.get_or_compute(self.key, self._evaluate)
+
+
+def source_node(well, curve):
+    """Node of a curve of a parsed well (already in memory, not cached again)."""
+    return Node("source", (well.key, curve), [], lambda: well.columns[curve], cached=False)
+
+
+def despike_node(dt, window, threshold, unit):
+    """Node of the sonic curve with cycle skips and spikes replaced by the rolling median."""
+    def compute(values):
+        flags, median = sonic_qc.detect(values, window, threshold, unit)
+        return sonic_qc.despike(values, flags, median).astype(values.dtype, copy=False)
+    return Node("despike", (int(window), float(threshold), str(unit).upper()), [dt], compute)
+
+
+def spike_node(depth, dt, window, threshold, unit):
+    """Node of the table of flagged cycle-skip and spike intervals of the sonic curve."""
+    def compute(depth_values, values):
+        flags, median = sonic_qc.detect(values, window, threshold, unit)
+        return sonic_qc.flagged_intervals(depth_values, values, flags, median)
+    return Node("spikes", (int(window), float(threshold), str(unit).upper()), [depth, dt], compute)
+
+
+def compaction_node(depth, dt, gr, cutoff, window, unit):
+    """Node of the compaction factor (Cp) from the shale trend picked on ``gr``."""
+    def compute(depth_values, dt_values, gr_values):
+        return compaction.compaction_factor(depth_values, dt_values, gr_values, cutoff, window, unit)
+    return Node("compaction", (float(cutoff), float(window), str(unit).upper()), [depth, dt, gr], compute)
+
+
+def porosity_node(dt, matrix, fluid, correction, unit, cp=None):
+    """Node of the porosity column of one matrix/fluid model, optionally divided by Cp."""
+    name = porosity.column_name(matrix, fluid)
+
+    def compute(values, *factor):
+        # float32 curves of a compact well give float32 porosity
+        dtype = np.result_type(values.dtype, np.float32)
+        return porosity.compute_porosity(values, [(matrix, fluid)], correction, unit, dtype,
+                                         compaction=factor[0] if factor else None)[name]
+    inputs = [dt] if cp is None else [dt, cp]
+    return Node("porosity", (matrix, fluid, correction, str(unit).upper()), inputs, compute)
+
+
+def average_node(dt, columns):
+    """Node of the Average Porosity of the given porosity column nodes."""
+    names = list(columns)
+
+    def compute(values, *arrays):
+        if not arrays:
+            return np.full(len(values), np.nan)
+        # Same NaN-skipping row mean as porosity.porosity_frame
+        return pd.DataFrame(dict(zip(names, arrays))).mean(axis=1).to_numpy()
+    return Node("average", tuple(names), [dt] + list(columns.values()), compute)
+
+
+class PorosityGraph:
+    """
+    Nodes of the Interpretation data set of one well and curve: Depth, the
+    sonic curve, one porosity column per selected model and the optional
+    Average Porosity, plus the result curve and the assembled frames.
+
+    ``compaction`` is None or a ``(gr_curve, cutoff, window)`` tuple; the
+    porosity columns are then divided by the compaction factor (Cp) node.
+    ``despike`` is None or a ``(window, threshold)`` tuple; the sonic curve
+    is then despiked (see sonic_qc) before everything else.
+    """
+
+    def __init__(self, well, curve, models, correction="None", unit="US/FT", average=False,
+                 compaction=None, despike=None):
+        self.unit = unit
+        self.depth = source_node(well, "DEPTH")
+        self.sonic = source_node(well, curve)
+        self.dt = self.sonic if despike is None else despike_node(self.sonic, *despike, unit)
+        self.cp = None
+        if compaction is not None:
+            gr, cutoff, window = compaction
+            self.cp = compaction_node(self.depth, self.dt, source_node(well, gr), cutoff, window, unit)
+        self.columns = OrderedDict(
+            (porosity.column_name(matrix, fluid),
+             porosity_node(self.dt, matrix, fluid, correction, unit, self.cp))
+            for matrix, fluid in models)
+        if average:
+            self.columns["Average Porosity"] = average_node(self.dt, dict(self.columns))
+
+    def spike_intervals(self, window=sonic_qc.WINDOW, threshold=sonic_qc.THRESHOLD):
+        """Return the flagged intervals of the recorded (not despiked) sonic curve."""
+        return spike_node(self.depth, self.sonic, window, threshold, self.unit).value()
+
+    def frame_node(self):
+        names = ["Depth", "Sonic Log Reading"] + list(self.columns)
+
+        def compute(*arrays):
+            # The frame shares the (read-only) node arrays instead of copying them
+            return pd.DataFrame(dict(zip(names, arrays)), copy=False)
+        return Node("frame", tuple(names), [self.depth, self.dt] + list(self.columns.values()), compute)
+
+    def result_node(self, method):
+        if method not in result_curves.RESULT_METHODS:
+            # A single model as the result curve is that column's node
+            return self.columns[method]
+        names = list(self.columns)
+
+        def compute(*arrays):
+            frame = pd.DataFrame(dict(zip(names, arrays)), columns=names)
+            return result_curves.result_curve(frame, method)
+        if not names:
+            return Node("result", (method,), [self.dt], lambda values: np.full(len(values), np.nan))
+        return Node("result", (method,), list(self.columns.values()), compute)
+
+    def frame(self):
+        """Return the data set (same columns as porosity.porosity_frame)."""
+        return self.frame_node().value()
+
+    def result_frame(self, method="Max"):
+        """Return Depth and the result curve (same as result_curves.result_frame)."""
+        return pd.DataFrame({
+            "Depth": self.depth.value(),
+            result_curves.result_name(method): self.result_node(method).value(),
+        })
@@ -0,0 +1,114 @@
+"""
+Compaction correction (Cp) from a shale baseline picked on gamma ray.
+
+Shale samples are the ones whose gamma ray reads at or above a cutoff. The
+sonic transit time of those samples gives a depth-varying shale trend
+(Δtsh): a centred rolling mean over a depth window, computed with prefix
+sums so the whole curve takes a few array passes, and interpolated across
+the sand intervals. The compaction factor is Cp = Δtsh / 100 (Δtsh in
+μsec/ft), never below 1, and every porosity column is divided by it.
+"""
+import numpy as np
+
+from porosity import METER_FACTOR
+
+# Default length of the shale trend window, in depth units of the log
+SHALE_WINDOW = 100.0
+
+
+def gamma_ray_curve(well):
+    """Return the mnemonic of the gamma-ray curve of a parsed well, or None."""
+    curves = well.curves[1:]
+    for curve in curves:
+        if curve["unit"].upper() in ("GAPI", "API"):
+            return curve["mnemonic"]
+    for curve in curves:
+        if curve["mnemonic"].upper().startswith("GR"):
+            return curve["mnemonic"]
+    return None
+
+
+def gr_range(gr):
+    """Return the (min, max) gamma-ray reading, or None for an all-null curve."""
+    gr = np.asarray(gr, dtype=np.float64)
+    if not np.isfinite(gr).any():
+        return None
+    return float(np.nanmin(gr)), float(np.nanmax(gr))
+
+
+def default_cutoff(gr):
+    """Midway between the clean (P5) and shale (P95) gamma-ray readings."""
+    gr = np.asarray(gr, dtype=np.float64)
+    if not np.isfinite(gr).any():
+        return 0.0
+    clean, shale = np.nanpercentile(gr, [5, 95])
+    return float((clean + shale) / 2)
+
+
+def shale_mask(gr, cutoff):
+    """Boolean mask of the shale samples (gamma ray at or above ``cutoff``)."""
+    gr = np.asarray(gr, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        return gr >= cutoff
+
+
+def shale_fraction(gr, cutoff):
+    """Fraction of the valid gamma-ray samples picked as shale."""
+    gr = np.asarray(gr, dtype=np.float64)
+    valid = np.count_nonzero(~np.isnan(gr))
+    return np.count_nonzero(shale_mask(gr, cutoff)) / valid if valid else 0.0
+
+
+def window_samples(depth, window):
+    """Number of samples spanned by a depth window (at least one)."""
+    depth = np.asarray(depth, dtype=np.float64)
+    step = np.nanmedian(np.abs(np.diff(depth))) if len(depth) > 1 else 0.0
+    if not step:
+        return 1
+    return max(int(round(window / step)), 1)
+
+
+def shale_trend(depth, dt, shale, samples):
+    """
+    Return the shale transit time trend at every sample: the mean DT of the
+    shale samples within ``samples`` rows centred on it, interpolated along
+    depth where the window holds no shale. NaN when no sample is shale.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    dt = np.asarray(dt, dtype=np.float64)
+    use = shale & ~np.isnan(dt)
+    n = len(dt)
+    if not use.any():
+        return np.full(n, np.nan)
+
+    # Prefix sums give every centred window sum and count at once
+    total = np.concatenate(([0.0], np.cumsum(np.where(use, dt, 0.0))))
+    count = np.concatenate(([0], np.cumsum(use)))
+    half = samples // 2
+    rows = np.arange(n)
+    low = np.clip(rows - half, 0, n)
+    high = np.clip(rows + half + 1, 0, n)
+    counts = count[high] - count[low]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        trend = np.where(counts > 0, (total[high] - total[low]) / counts, np.nan)
+
+    # Fill the gaps between shale windows along depth (ends take the nearest value)
+    known = ~np.isnan(trend) & ~np.isnan(depth)
+    missing = np.isnan(trend) & ~np.isnan(depth)
+    if missing.any():
+        order = np.argsort(depth[known])
+        trend[missing] = np.interp(depth[missing], depth[known][order], trend[known][order])
+    return trend
+
+
+def compaction_factor(depth, dt, gr, cutoff, window=SHALE_WINDOW, unit="US/FT"):
+    """
+    Return Cp = Δtsh / 100 for every sample (1 where no shale trend exists).
+    ``dt`` in ``unit`` (μsec/m or μsec/ft), ``window`` in depth units.
+    """
+    trend = shale_trend(depth, dt, shale_mask(gr, cutoff), window_samples(depth, window))
+    if str(unit).upper() == "US/M":
+        # Cp is defined on transit times in μsec/ft
+        trend = trend * METER_FACTOR
+    cp = trend / 100.0
+    return np.where(np.isnan(cp), 1.0, np.maximum(cp, 1.0))
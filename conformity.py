@@ -0,0 +1,148 @@
+"""
+LAS conformity check service.
+
+The lascheck conformity check runs once per file hash and its result (the
+non-conformity list, or the error raised while reading) is cached. Progress
+is real: lascheck reads the file through a wrapper that reports how far the
+read has gone and which section (~V, ~W, ~C, ~P, ~O, ~A) it is in. A check
+can also run in a background worker thread that the page polls.
+"""
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import lascheck
+
+from las_loader import decode_las
+from lru import LRUCache
+
+# Section titles reported while the file is read
+SECTIONS = {
+    "~V": "~V Version information",
+    "~W": "~W Well information",
+    "~C": "~C Curve information",
+    "~P": "~P Parameter information",
+    "~O": "~O Other information",
+    "~A": "~A ASCII log data",
+}
+
+# Share of the progress bar taken by reading the file (the rest is the rules)
+READ_SHARE = 0.9
+
+# Lines read between two progress updates
+PROGRESS_LINES = 2048
+
+result_cache = LRUCache(max_entries=64, max_bytes=float("inf"), sizeof=lambda result: 0)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lascheck")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class ConformityResult:
+    """Outcome of a conformity check of one file."""
+
+    def __init__(self, conforms=False, non_conformities=None, error=None, details=None):
+        self.conforms = conforms
+        self.non_conformities = non_conformities or []
+        self.error = error
+        self.details = details
+
+
+class _ProgressReader(StringIO):
+    # StringIO that reports position and current section while lascheck iterates it
+
+    def __init__(self, text, progress):
+        super().__init__(text)
+        self._size = max(len(text), 1)
+        self._progress = progress
+        self._lines = 0
+        self.section = "Reading file"
+
+    def __next__(self):
+        line = super().__next__()
+        self._lines += 1
+        new_section = line[:2].upper() in SECTIONS and line[:2].upper()
+        if new_section:
+            self.section = SECTIONS[new_section]
+        if new_section or self._lines % PROGRESS_LINES == 0:
+            self._progress(READ_SHARE * self.tell() / self._size, self.section)
+        return line
+
+
+def _read_text(source):
+    # ``source`` is a path or the in-memory buffer the well was parsed from
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            source = f.read()
+    return decode_las(source)
+
+
+def run_check(source, progress=None):
+    """
+    Read ``source`` with lascheck and check its conformity once.
+
+    ``progress(fraction, message)`` is called as the file is read and the
+    rules are checked. Errors are captured in the result instead of raised.
+    """
+    if progress is None:
+        def progress(fraction, message):
+            pass
+
+    try:
+        las = lascheck.read(_ProgressReader(_read_text(source), progress))
+        progress(READ_SHARE, "Checking conformity rules")
+        conforms = las.check_conformity()
+        non_conformities = [] if conforms else las.get_non_conformities()
+        result = ConformityResult(conforms, non_conformities)
+    except Exception as e:
+        result = ConformityResult(error=str(e), details=traceback.format_exc())
+    progress(1.0, "Conformity check complete")
+    return result
+
+
+def get_result(key):
+    """Return the cached result for a file hash, or None."""
+    return result_cache.get(key)
+
+
+def check(key, source, progress=None):
+    """Return the result for a file hash, running the check on a cache miss."""
+    return result_cache.get_or_compute(key, lambda: run_check(source, progress))
+
+
+class ConformityJob:
+    """A check running in the background worker; the page polls its progress."""
+
+    def __init__(self, key, source):
+        self.key = key
+        self.fraction = 0.0
+        self.message = "Waiting for worker"
+        self._future = _executor.submit(self._run, source)
+
+    def _update(self, fraction, message):
+        self.fraction = fraction
+        self.message = message
+
+    def _run(self, source):
+        result = run_check(source, self._update)
+        result_cache.put(self.key, result)
+        with _jobs_lock:
+            _jobs.pop(self.key, None)
+        return result
+
+    def done(self):
+        return self._future.done()
+
+    def result(self):
+        return self._future.result()
+
+
+def submit(key, source):
+    """Start (or join) a background check of a file and return its job."""
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None:
+            job = _jobs[key] = ConformityJob(key, source)
+        return job
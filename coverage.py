@@ -0,0 +1,81 @@
+"""
+Missing-data overview of a well.
+
+The null runs of every curve are run-length encoded once at ingest (see
+null_mask.null_runs) as (start, stop) row pairs. The coverage table and the
+interval-bar figure are built from those runs, so their cost follows the
+number of gaps instead of the number of samples.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+
+def _gap_extents(depth, runs):
+    # Depth interval covered by each run, extended by half a step on both sides
+    step = np.median(np.abs(np.diff(depth))) if len(depth) > 1 else 0.0
+    top = depth[runs[:, 0]] - step / 2
+    bottom = depth[runs[:, 1] - 1] + step / 2
+    return top, bottom
+
+
+def coverage_summary(depth, runs_by_curve):
+    """
+    Return the coverage table: per curve, the percentage of valid samples,
+    the first and last valid depth, the number of gaps and the longest gap.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    n = len(depth)
+    rows = []
+    for name, runs in runs_by_curve.items():
+        missing = int((runs[:, 1] - runs[:, 0]).sum()) if len(runs) else 0
+        first = 0
+        last = n - 1
+        # Runs touching either end of the log are leading/trailing nulls
+        if len(runs) and runs[0, 0] == 0:
+            first = runs[0, 1]
+        if len(runs) and runs[-1, 1] == n:
+            last = runs[-1, 0] - 1
+        interior = runs[(runs[:, 0] > 0) & (runs[:, 1] < n)] if len(runs) else runs
+        if len(interior):
+            top, bottom = _gap_extents(depth, interior)
+            longest = float(np.max(np.abs(bottom - top)))
+        else:
+            longest = 0.0
+        has_data = missing < n
+        rows.append({
+            "Curve": name,
+            "Coverage (%)": round(100.0 * (n - missing) / n, 2) if n else 0.0,
+            "First Valid Depth": depth[first] if has_data else np.nan,
+            "Last Valid Depth": depth[last] if has_data else np.nan,
+            "Gaps": len(interior),
+            "Longest Gap": longest,
+        })
+    return pd.DataFrame(rows)
+
+
+def plot_coverage(depth, runs_by_curve, figsize=(16, 10)):
+    """
+    Return a figure with one column per curve: dark where data is present
+    and white over every null run, depth increasing downwards.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    names = list(runs_by_curve)
+    fig, ax = plt.subplots(figsize=figsize)
+    if len(depth):
+        top, bot = min(depth[0], depth[-1]), max(depth[0], depth[-1])
+        ax.bar(range(len(names)), bot - top, bottom=top, width=0.8, color="dimgray")
+        for i, name in enumerate(names):
+            runs = runs_by_curve[name]
+            if len(runs):
+                gap_top, gap_bottom = _gap_extents(depth, runs)
+                ax.bar(np.full(len(runs), i), gap_bottom - gap_top, bottom=gap_top,
+                       width=0.8, color="white", linewidth=0)
+        ax.set_ylim(bot, top)
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45, ha="left")
+    ax.xaxis.set_ticks_position("top")
+    ax.set_ylabel("Depth")
+    for spine in ("right", "bottom"):
+        ax.spines[spine].set_visible(False)
+    return fig
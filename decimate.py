@@ -0,0 +1,70 @@
+"""
+Depth-window slicing and min/max envelope decimation for log tracks.
+
+A track only has as many pixel rows as its height on screen, so plotting
+more than two points per pixel row adds cost without adding detail. Curves
+are first sliced to the selected depth window, then every bin of samples is
+reduced to its minimum and maximum (kept in depth order), which preserves
+spikes such as cycle-skips.
+"""
+import numpy as np
+
+from depth_index import DepthIndex
+
+
+def depth_window(depth, top, bot, index=None):
+    """
+    Return the slice (or boolean mask) of the samples covering top..bot.
+
+    ``index`` is a prebuilt DepthIndex of ``depth``; with it, a regular log
+    is sliced in constant time.
+    """
+    if index is None:
+        index = DepthIndex(depth)
+    # Keep one sample beyond each edge so lines reach the track border
+    return index.window(top, bot, margin=1)
+
+
+def minmax_envelope(depth, values, n_bins):
+    """
+    Decimate a curve to at most ``2 * n_bins`` points.
+
+    Each bin of consecutive samples contributes the samples holding its
+    minimum and maximum, in depth order. NaN gaps survive as NaN points so
+    the plotted line still breaks over missing data.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    n_bins = max(int(n_bins), 1)
+    if n <= 2 * n_bins:
+        return depth, values
+
+    size = -(-n // n_bins)
+    n_bins = -(-n // size)
+    padded = np.full(n_bins * size, np.nan)
+    padded[:n] = values
+    bins = padded.reshape(n_bins, size)
+
+    # argmin/argmax ignoring NaN; an all-NaN bin points at a NaN sample
+    imin = np.argmin(np.where(np.isnan(bins), np.inf, bins), axis=1)
+    imax = np.argmax(np.where(np.isnan(bins), -np.inf, bins), axis=1)
+    offsets = np.arange(n_bins) * size
+    index = np.sort(np.column_stack([imin, imax]), axis=1) + offsets[:, np.newaxis]
+    index = np.minimum(index.ravel(), n - 1)
+    return depth[index], values[index]
+
+
+def decimate_frame(frame, columns, depth_column, top, bot, n_bins, index=None):
+    """
+    Slice ``frame`` to the depth window and decimate each of ``columns``.
+
+    Returns a dict mapping column name to its ``(depth, values)`` arrays.
+    """
+    depth = frame[depth_column].to_numpy(dtype=np.float64)
+    window = depth_window(depth, top, bot, index)
+    depth = depth[window]
+    return {
+        column: minmax_envelope(depth, frame[column].to_numpy(dtype=np.float64)[window], n_bins)
+        for column in columns
+    }
@@ -0,0 +1,168 @@
+"""
+Implicit depth and depth-to-row lookup of regularly sampled logs.
+
+Most LAS files are sampled at a constant STEP, so their depth curve is fully
+described by ``start``, ``step`` and ``count``. Storing those three numbers
+instead of one float64 per sample is what the compact well mode uses, and it
+turns a depth interval into a row slice with two divisions.
+"""
+import math
+
+import numpy as np
+
+# Largest deviation from the regular grid, as a fraction of the step, for a
+# depth curve to be treated as regular (LAS depths are printed rounded)
+STEP_TOLERANCE = 1e-3
+
+
+class RegularDepth:
+    """Depth ``start + i * step`` for ``i`` in ``range(count)``."""
+
+    def __init__(self, start, step, count):
+        self.start = float(start)
+        self.step = float(step)
+        self.count = int(count)
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"RegularDepth(start={self.start!r}, step={self.step!r}, count={self.count!r})"
+
+    @property
+    def nbytes(self):
+        # Three numbers, whatever the length of the log
+        return 24
+
+    def values(self):
+        """Materialize the depth curve as a float64 array."""
+        return self.start + self.step * np.arange(self.count, dtype=np.float64)
+
+
+def regular_depth(depth, tolerance=STEP_TOLERANCE):
+    """
+    Return a RegularDepth matching ``depth`` when it is regularly sampled
+    (within ``tolerance`` of a step), otherwise None.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    if len(depth) < 2 or np.isnan(depth).any():
+        return None
+    step = (depth[-1] - depth[0]) / (len(depth) - 1)
+    if step == 0:
+        return None
+    grid = RegularDepth(depth[0], step, len(depth))
+    if np.max(np.abs(depth - grid.values())) > tolerance * abs(step):
+        return None
+    return grid
+
+
+class DepthIndex:
+    """
+    Depth-to-row lookup of a depth curve.
+
+    Regular logs map a depth interval to a row slice arithmetically, in
+    constant time. Irregular monotonic logs fall back to binary search, and
+    non-monotonic ones to a boolean mask.
+    """
+
+    def __init__(self, depth):
+        if isinstance(depth, RegularDepth):
+            self.regular = depth
+            self.depth = None
+            self.count = depth.count
+            self.decreasing = depth.step < 0
+            self.monotonic = True
+            return
+        self.depth = np.asarray(depth, dtype=np.float64)
+        self.count = len(self.depth)
+        self.regular = regular_depth(self.depth)
+        diff = np.diff(self.depth)
+        self.decreasing = self.count > 1 and bool(np.all(diff <= 0)) and self.depth[0] > self.depth[-1]
+        self.monotonic = self.regular is not None or self.decreasing or bool(np.all(diff >= 0))
+
+    def __len__(self):
+        return self.count
+
+    def slices(self, tops, bots):
+        """
+        Return ``(starts, stops)`` row arrays of the samples within each
+        interval ``[top, bot]`` (either order). Requires a monotonic log.
+        """
+        tops, bots = np.asarray(tops, dtype=np.float64), np.asarray(bots, dtype=np.float64)
+        low, high = np.minimum(tops, bots), np.maximum(tops, bots)
+        if self.regular is not None:
+            grid = self.regular
+            # Fractional rows of both edges; a step below zero flips them
+            a = (low - grid.start) / grid.step
+            b = (high - grid.start) / grid.step
+            first, last = np.minimum(a, b), np.maximum(a, b)
+            starts = np.clip(np.ceil(first - 1e-9), 0, self.count).astype(np.intp)
+            stops = np.clip(np.floor(last + 1e-9) + 1, 0, self.count).astype(np.intp)
+            if self.depth is not None:
+                starts, stops = self._snap(starts, stops, low, high)
+        elif not self.monotonic:
+            raise ValueError("depth curve is not monotonic")
+        elif self.decreasing:
+            starts = np.searchsorted(-self.depth, -high, side="left")
+            stops = np.searchsorted(-self.depth, -low, side="right")
+        else:
+            starts = np.searchsorted(self.depth, low, side="left")
+            stops = np.searchsorted(self.depth, high, side="right")
+        starts = np.clip(starts, 0, self.count).astype(np.intp)
+        stops = np.clip(stops, 0, self.count).astype(np.intp)
+        return starts, np.maximum(stops, starts)
+
+    def _snap(self, starts, stops, low, high):
+        # Recorded depths deviate from the grid by less than a step, so each
+        # edge is at most one row off: check the neighbouring samples
+        def inside(rows):
+            values = self.depth[np.clip(rows, 0, self.count - 1)]
+            return (values >= low) & (values <= high)
+        starts = starts - ((starts > 0) & inside(starts - 1))
+        starts = starts + ((starts < self.count) & (starts < stops) & ~inside(starts))
+        stops = stops + ((stops < self.count) & inside(stops))
+        stops = stops - ((stops > starts) & ~inside(stops - 1))
+        return starts, stops
+
+    def window(self, top, bot, margin=0):
+        """
+        Return the rows within ``[top, bot]`` as a slice, widened by ``margin``
+        rows on each side, or as a boolean mask for a non-monotonic log.
+        """
+        top, bot = min(top, bot), max(top, bot)
+        if not self.monotonic:
+            return (self.depth >= top) & (self.depth <= bot)
+        if self.regular is not None:
+            start, stop = self._regular_bounds(top, bot)
+        else:
+            starts, stops = self.slices([top], [bot])
+            start, stop = int(starts[0]), int(stops[0])
+        return slice(max(start - margin, 0), min(stop + margin, self.count))
+
+    def _regular_bounds(self, low, high):
+        # Scalar version of slices() for a regular log: plain float arithmetic
+        grid = self.regular
+        # Clamped to the log first, so infinite edges stay finite
+        a = min(max((low - grid.start) / grid.step, -1.0), self.count + 1.0)
+        b = min(max((high - grid.start) / grid.step, -1.0), self.count + 1.0)
+        start = min(max(math.ceil(min(a, b) - 1e-9), 0), self.count)
+        stop = min(max(math.floor(max(a, b) + 1e-9) + 1, 0), self.count)
+        if self.depth is not None:
+            def inside(row):
+                return 0 <= row < self.count and low <= self.depth[row] <= high
+            if inside(start - 1):
+                start -= 1
+            elif start < stop and not inside(start):
+                start += 1
+            if inside(stop):
+                stop += 1
+            elif stop > start and not inside(stop - 1):
+                stop -= 1
+        return start, max(stop, start)
+
+    def row(self, depth):
+        """Return the row of the sample nearest to ``depth``."""
+        if self.regular is not None:
+            row = round((depth - self.regular.start) / self.regular.step)
+            return int(min(max(row, 0), self.count - 1))
+        return int(np.nanargmin(np.abs(self.depth - depth)))
@@ -0,0 +1,13 @@
+"""
+On/off switches read from environment variables ($SONIC_PROFILE,
+$SONIC_COMPACT, ...).
+"""
+import os
+
+# Values that leave a switch off; anything else turns it on
+OFF_VALUES = ("", "0", "false", "no")
+
+
+def enabled(name):
+    """True when the environment variable ``name`` is set to any value but "", 0, false or no."""
+    return os.environ.get(name, "").strip().lower() not in OFF_VALUES
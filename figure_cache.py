@@ -0,0 +1,41 @@
+"""
+Cache of rendered Log Visualization figures.
+
+Figures are rasterized to PNG once per combination of plot inputs (file
+hash, curve, selected models, correction, result curve, depth window,
+scales and grids) and the bytes are kept in an LRU cache. Reruns that do not
+change any plot input, e.g. toggling Formation Evaluation, skip matplotlib
+entirely and send the cached image.
+"""
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+
+from log_plot import PAD_INCHES, render_dpi
+from lru import LRUCache
+
+# Bounds of the shared figure cache
+MAX_ENTRIES = 48
+MAX_BYTES = 256 * 1024 * 1024
+
+figure_cache = LRUCache(MAX_ENTRIES, MAX_BYTES)
+
+
+def render_png(render):
+    """Call ``render()`` for a matplotlib figure and return it as PNG bytes."""
+    fig = render()
+    try:
+        buffer = BytesIO()
+        # Same options st.pyplot uses, at a resolution that keeps the cropped
+        # image within the width st.image sends without re-encoding it
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+        dpi = render_dpi(bbox.width + 2 * PAD_INCHES)
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight", pad_inches=PAD_INCHES)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def get_png(key, render):
+    """Return the PNG bytes for ``key``, rendering the figure on a cache miss."""
+    return figure_cache.get_or_compute(key, lambda: render_png(render))
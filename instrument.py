@@ -0,0 +1,144 @@
+"""
+Opt-in per-stage instrumentation of a Streamlit rerun.
+
+Each stage of the Interpretation page runs inside ``profiler.stage(name)``,
+which records its wall time, the CPU time of the script thread and the
+memory allocated (net and peak, traced by tracemalloc). Profiling is off
+unless ``$SONIC_PROFILE`` is set or the sidebar toggle is on; when off a
+stage is a no-op. The stages of the last reruns are kept so the panel can
+show a breakdown and the history can be exported as CSV.
+
+tracemalloc traces every thread of the process, so allocations of other
+sessions running at the same time are counted too.
+"""
+import contextlib
+import time
+import tracemalloc
+import weakref
+from collections import deque
+
+import pandas as pd
+
+import env_flags
+
+# Reruns kept in the history of a session
+MAX_RERUNS = 200
+
+# Profilers of the sessions that have profiling on; tracemalloc is process-wide
+# and stops only when none is left
+_active = weakref.WeakSet()
+
+COLUMNS = ["Rerun", "Started", "Stage", "Depth", "Start (ms)", "Wall (ms)", "CPU (ms)",
+           "Allocated (MB)", "Peak (MB)"]
+
+
+def enabled_by_env():
+    """True when ``$SONIC_PROFILE`` asks for profiling (see env_flags.enabled)."""
+    return env_flags.enabled("SONIC_PROFILE")
+
+
+class Profiler:
+    """Stage timings of the reruns of one session."""
+
+    def __init__(self, max_reruns=MAX_RERUNS):
+        self.enabled = False
+        self.history = deque(maxlen=max_reruns)
+        self._rerun = 0
+        self._stages = []
+        self._peaks = []
+        self._origin = 0.0
+        self._started = None
+
+    def start_rerun(self, enabled):
+        """Begin recording a rerun (called once at the top of the script)."""
+        self.enabled = enabled
+        if not enabled:
+            _active.discard(self)
+            if tracemalloc.is_tracing() and not _active:
+                tracemalloc.stop()
+            return
+        _active.add(self)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._rerun += 1
+        self._stages = []
+        self._peaks = []
+        self._origin = time.perf_counter()
+        self._started = pd.Timestamp.now().isoformat(timespec="seconds")
+        self.history.append((self._rerun, self._started, self._stages))
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Record the time and memory of the enclosed block as stage ``name``."""
+        if not self.enabled:
+            yield
+            return
+        # tracemalloc has a single peak: fold it into the enclosing stage
+        # before resetting it, and hand this stage's peak back on exit
+        current, peak = tracemalloc.get_traced_memory()
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(current)
+        depth = len(self._peaks) - 1
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu
+            end = time.perf_counter()
+            after, peak = tracemalloc.get_traced_memory()
+            peak = max(self._peaks.pop(), peak)
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self._stages.append({
+                "Stage": name,
+                "Depth": depth,
+                "Start (ms)": (wall - self._origin) * 1000,
+                "Wall (ms)": (end - wall) * 1000,
+                "CPU (ms)": cpu * 1000,
+                "Allocated (MB)": (after - current) / 1e6,
+                "Peak (MB)": (peak - current) / 1e6,
+            })
+
+    def last_rerun(self):
+        """Return the stage table of the last recorded rerun."""
+        if not self.history:
+            return pd.DataFrame(columns=COLUMNS)
+        rerun, started, stages = self.history[-1]
+        return self._frame([(rerun, started, stages)])
+
+    def history_frame(self):
+        """Return every recorded stage of the kept reruns."""
+        return self._frame(self.history)
+
+    @staticmethod
+    def _frame(reruns):
+        rows = [{"Rerun": rerun, "Started": started, **stage}
+                for rerun, started, stages in reruns
+                for stage in sorted(stages, key=lambda s: s["Start (ms)"])]
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def stage_chart(stages):
+    """
+    Return a flame-style chart of one rerun: one bar per stage from its start
+    to its end, nested stages drawn one row below their parent.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for _, stage in stages.iterrows():
+        fig.add_trace(go.Bar(
+            x=[stage["Wall (ms)"]], base=[stage["Start (ms)"]], y=[stage["Depth"]],
+            orientation="h", name=stage["Stage"], text=stage["Stage"],
+            textposition="inside", insidetextanchor="start",
+            hovertemplate=(f"{stage['Stage']}<br>wall %{{x:.1f}} ms<br>"
+                           f"CPU {stage['CPU (ms)']:.1f} ms<br>peak {stage['Peak (MB)']:.1f} MB"
+                           "<extra></extra>")))
+    depth = int(stages["Depth"].max()) + 1 if len(stages) else 1
+    fig.update_layout(barmode="overlay", showlegend=False, height=80 + 40 * depth,
+                      margin=dict(l=10, r=10, t=10, b=30), xaxis_title="ms since rerun start")
+    fig.update_yaxes(autorange="reversed", visible=False)
+    return fig
@@ -0,0 +1,346 @@
+"""
+Parsed-LAS cache.
+
+Streamlit re-executes the whole script on every widget interaction. Parsing
+is keyed by a hash of the file content and the result is kept in a
+size-bounded LRU cache, so reruns hit memory and only genuinely new uploads
+are parsed. The cache lives in this module, which Streamlit imports once per
+server process, so it survives reruns and is shared between sessions. Below
+it, parsed wells persist in the memory-mapped on-disk store (well_store), so
+a file seen by any process is never parsed again.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import cached_property
+from io import StringIO
+
+import lasio
+import numpy as np
+import pandas as pd
+
+import depth_index
+import env_flags
+import las_reader
+from lru import LRUCache
+import null_mask
+import well_store
+
+# Units of a sonic (DT) curve
+SONIC_UNITS = ("US/M", "US/FT", "US/F")
+
+# Default bounds of the shared cache
+MAX_ENTRIES = 8
+MAX_BYTES = 512 * 1024 * 1024
+
+# Files larger than this are parsed with the chunked ~A reader
+CHUNKED_THRESHOLD = 32 * 1024 * 1024
+
+# Bytes read per chunk when hashing a file on disk
+HASH_CHUNK = 4 * 1024 * 1024
+
+
+def content_key(data):
+    """Return the cache key (hex digest) of the raw bytes of a LAS file."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def content_key_path(path):
+    """Return the cache key of a LAS file on disk, hashing it in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upload_buffer(upload):
+    """
+    Return the raw bytes of an uploaded file without copying them.
+
+    Streamlit's UploadedFile is a BytesIO over the received bytes, and
+    ``getvalue()`` hands back that same bytes object. The buffer is parsed
+    once and shared with the conformity check; nothing is written to disk.
+    """
+    return upload.getvalue()
+
+
+def decode_las(data):
+    # LAS files are ASCII, but headers often carry latin-1 characters (e.g. °).
+    # ``data`` is any bytes-like buffer (bytes, memoryview), decoded in place.
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError:
+        return str(data, "latin-1")
+
+
+def release_curve_data(las_file):
+    """
+    Drop the curve arrays of a lasio LASFile in place, keeping the header
+    sections and curve metadata, and return it.
+    """
+    for curve in las_file.curves:
+        curve.data = np.empty(0)
+    las_file.index_initial = None
+    return las_file
+
+
+def _runs_nbytes(null_runs):
+    return sum(runs.nbytes for runs in null_runs.values())
+
+
+class ParsedWell:
+    """
+    A parsed LAS file: the lasio header/curve metadata plus a columnar NumPy
+    copy of the data with ``DEPTH`` as the first column. Null sentinels are
+    already replaced by NaN; ``null_report`` lists what was masked.
+    """
+
+    def __init__(self, key, las_file, stored=None):
+        self.key = key
+        # Hash of the file bytes, shared with the compact copy of the well
+        self.content_hash = key
+        self.las_file = las_file
+        self.header = {
+            section: {item.mnemonic: item.value for item in las_file.header[section]}
+            for section in ("Version", "Well", "Parameter")
+            if section in las_file.header
+        }
+        self.curves = [
+            {"mnemonic": curve.mnemonic, "unit": curve.unit, "descr": curve.descr}
+            for curve in las_file.curves
+        ]
+
+        self.null_value = null_mask.declared_null(las_file)
+
+        if stored is not None:
+            # Reloaded from the well store: memory-mapped, already masked columns
+            self.columns = OrderedDict(stored["columns"])
+            self.null_report = stored["null_report"]
+            self.null_runs = stored["null_runs"]
+            return
+
+        # Columnar data: DEPTH (the index curve) followed by every other curve,
+        # each copied out of lasio's (rows, curves) array so that array is freed
+        columns = OrderedDict()
+        if len(las_file.curves):
+            columns["DEPTH"] = np.array(las_file.curves[0].data, dtype=np.float64)
+            for curve in las_file.curves[1:]:
+                columns[curve.mnemonic] = np.array(curve.data, dtype=np.float64)
+
+        # Declared and de-facto null sentinels become NaN once, at ingest
+        masked, self.null_report = null_mask.mask_nulls(columns, self.null_value)
+        self.columns = OrderedDict(masked)
+        # The columns are the data now; lasio's arrays (unmasked originals of
+        # the masked curves) would otherwise stay alive uncounted
+        release_curve_data(las_file)
+        # Run-length encoded null runs of every curve, for the coverage overview
+        self.null_runs = null_mask.null_runs_by_curve(self.columns)
+        for column in self.columns.values():
+            column.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values()) + _runs_nbytes(self.null_runs)
+
+    def __len__(self):
+        return len(self.columns["DEPTH"]) if self.columns else 0
+
+    @cached_property
+    def depth_index(self):
+        """Depth-to-row lookup of the well, built on first use."""
+        return depth_index.DepthIndex(self.columns["DEPTH"] if self.columns else np.empty(0))
+
+    def sonic_curve(self):
+        """Return the mnemonic of the sonic (DT) curve, or None if there is none."""
+        curves = self.curves[1:]
+        for curve in curves:
+            if curve["unit"].upper() in SONIC_UNITS:
+                return curve["mnemonic"]
+        for curve in curves:
+            if curve["mnemonic"].upper().startswith("DT"):
+                return curve["mnemonic"]
+        return None
+
+    def curve_unit(self, mnemonic):
+        """Return the unit of a curve as written in the ~C section."""
+        for curve in self.curves:
+            if curve["mnemonic"] == mnemonic:
+                return curve["unit"]
+        return ""
+
+    def df(self):
+        """Return a fresh DataFrame with DEPTH as the first column and a RangeIndex."""
+        return pd.DataFrame(self.columns)
+
+
+class CompactColumns(Mapping):
+    """
+    Column mapping of a compact well: float32 curves and a depth that is
+    implicit (start/step/count) for regular logs. ``DEPTH`` is materialized
+    as float64 when accessed.
+    """
+
+    def __init__(self, depth, curves):
+        self.depth = depth
+        self.curves = curves
+
+    def __getitem__(self, name):
+        if name == "DEPTH":
+            return self.depth.values() if isinstance(self.depth, depth_index.RegularDepth) else self.depth
+        return self.curves[name]
+
+    def __iter__(self):
+        yield "DEPTH"
+        yield from self.curves
+
+    def __len__(self):
+        return len(self.curves) + 1
+
+    @property
+    def nbytes(self):
+        return self.depth.nbytes + sum(values.nbytes for values in self.curves.values())
+
+
+class CompactWell(ParsedWell):
+    """
+    Compact copy of a ParsedWell: every curve as float32 and, for regularly
+    sampled logs, depth stored as start/step/count. ``df()`` shares the
+    curve arrays instead of copying them. Only the header of the lasio file
+    is kept (release_curve_data).
+    """
+
+    def __init__(self, well):
+        self.key = well.key + ":compact"
+        self.content_hash = well.content_hash
+        self.las_file = release_curve_data(well.las_file)
+        self.header = well.header
+        self.curves = well.curves
+        self.null_value = well.null_value
+        self.null_report = well.null_report
+        self.null_runs = well.null_runs
+
+        depth = well.columns["DEPTH"] if well.columns else np.empty(0)
+        regular = depth_index.regular_depth(depth)
+        curves = OrderedDict()
+        for name, values in well.columns.items():
+            if name != "DEPTH":
+                curves[name] = values.astype(np.float32)
+                curves[name].flags.writeable = False
+        self.columns = CompactColumns(regular if regular is not None else np.array(depth), curves)
+
+    @property
+    def nbytes(self):
+        return self.columns.nbytes + _runs_nbytes(self.null_runs)
+
+    def __len__(self):
+        return len(self.columns.depth)
+
+    @cached_property
+    def depth_index(self):
+        """Depth-to-row lookup straight from the implicit depth (no array needed)."""
+        return depth_index.DepthIndex(self.columns.depth)
+
+    def df(self):
+        """Return a DataFrame over the shared float32 curves, DEPTH first."""
+        return pd.DataFrame(dict(self.columns), copy=False)
+
+
+def parse_las(data, key=None):
+    """Parse the raw bytes of a LAS file into a ParsedWell."""
+    if key is None:
+        key = content_key(data)
+    if len(data) > CHUNKED_THRESHOLD:
+        try:
+            return ParsedWell(key, las_reader.read_las_chunked(data))
+        except ValueError:
+            # Wrapped or non-numeric data: let lasio handle it
+            pass
+    # null_policy='none' leaves the sentinels in place so mask_nulls is the
+    # only null detector, as on the chunked path
+    las_file = lasio.read(StringIO(decode_las(data)), null_policy="none")
+    return ParsedWell(key, las_file)
+
+
+def parse_las_path(path, key=None):
+    """Parse a LAS file on disk, streaming large files through the chunked reader."""
+    if key is None:
+        key = content_key_path(path)
+    if os.path.getsize(path) > CHUNKED_THRESHOLD:
+        try:
+            return ParsedWell(key, las_reader.read_las_chunked(path))
+        except ValueError:
+            pass
+    with open(path, "rb") as f:
+        return parse_las(f.read(), key)
+
+
+def restore_well(key):
+    """Return the ParsedWell stored on disk under ``key`` (memory-mapped), or None."""
+    stored = well_store.load(key)
+    if stored is None:
+        return None
+    return ParsedWell(key, las_reader.header_las(stored["header"]), stored)
+
+
+def store_well(well, source):
+    """Write a parsed well to the on-disk store; ``source`` (path or bytes) gives the header."""
+    try:
+        header = las_reader.header_text(source)
+    except ValueError:
+        return False
+    return well_store.save(well.key, header, well.columns, well.null_report, well.null_runs)
+
+
+class LasCache(LRUCache):
+    """
+    LRU cache of ParsedWell objects bounded by entry count and total bytes.
+
+    A miss first looks in the on-disk well store and only parses the LAS
+    text when the file was never seen; newly parsed wells are stored.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        super().__init__(max_entries, max_bytes, sizeof=lambda well: well.nbytes)
+
+    def _restore_or_parse(self, key, source, parse, compact):
+        well = restore_well(key)
+        if well is None:
+            well = parse()
+            store_well(well, source)
+        # In compact mode only the float32 copy is kept in memory
+        return CompactWell(well) if compact else well
+
+    def get_or_parse(self, data, compact=False):
+        """Return the cached ParsedWell (or CompactWell) for ``data``, parsing it on a miss."""
+        key = content_key(data)
+        return self.get_or_compute(
+            key + ":compact" if compact else key,
+            lambda: self._restore_or_parse(key, data, lambda: parse_las(data, key), compact))
+
+    def get_or_parse_path(self, path, compact=False):
+        """Return the cached ParsedWell (or CompactWell) for a file on disk, parsing it on a miss."""
+        key = content_key_path(path)
+        return self.get_or_compute(
+            key + ":compact" if compact else key,
+            lambda: self._restore_or_parse(key, path, lambda: parse_las_path(path, key), compact))
+
+
+# Cache shared by every session of the app
+las_cache = LasCache()
+
+
+def compact_by_env():
+    """True when ``$SONIC_COMPACT`` asks for compact wells (see env_flags.enabled)."""
+    return env_flags.enabled("SONIC_COMPACT")
+
+
+def load_las(data, compact=False):
+    """Return the ParsedWell for the raw bytes of a LAS file (cached)."""
+    return las_cache.get_or_parse(data, compact)
+
+
+def load_las_path(path, compact=False):
+    """Return the ParsedWell for a LAS file on disk (cached by content)."""
+    return las_cache.get_or_parse_path(path, compact)
@@ -0,0 +1,182 @@
+"""
+Chunked LAS reader for very large files.
+
+The header sections (~V, ~W, ~P, ~C, ...) are parsed separately with lasio,
+then the ~A data section is streamed in blocks of rows that are parsed with
+NumPy straight into preallocated float64 column arrays. Memory stays at the
+size of the final arrays plus one block, instead of lasio's full text copy,
+line lists and DataFrame. ``iter_data_blocks`` gives a constant-memory mode
+that never materialises the whole well.
+"""
+import warnings
+from io import BytesIO, StringIO
+
+import lasio
+import numpy as np
+
+# Rows parsed per block
+BLOCK_ROWS = 65536
+
+# Bytes read per chunk while counting rows
+COUNT_CHUNK = 4 * 1024 * 1024
+
+
+def _open_binary(source):
+    # Accept a path, raw bytes or an already open binary file object
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BytesIO(source), True
+    if isinstance(source, str):
+        return open(source, "rb"), True
+    return source, False
+
+
+def _decode(line):
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        return line.decode("latin-1")
+
+
+def _read_header_text(f):
+    # Header lines up to (and including) a bare ~A line, and the data offset
+    lines = []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("No ~A section found in the LAS file")
+        if line.lstrip().startswith(b"~A"):
+            break
+        lines.append(_decode(line))
+    return "".join(lines) + "~A\n", f.tell()
+
+
+def header_las(text):
+    """Return a lasio LASFile (with empty curves) from the header text of a LAS file."""
+    return lasio.read(StringIO(text), ignore_data=True)
+
+
+def header_text(source):
+    """Return the header text of a LAS file (path or raw bytes), ending with a bare ~A line."""
+    f, owned = _open_binary(source)
+    try:
+        return _read_header_text(f)[0]
+    finally:
+        if owned:
+            f.close()
+
+
+def read_header(f):
+    """
+    Read the header of an open binary LAS file up to the ~A line.
+
+    Returns ``(las_file, data_offset)``: a lasio LASFile holding the header
+    sections and curve metadata (with empty curves), and the byte offset of
+    the first data line.
+    """
+    text, data_offset = _read_header_text(f)
+    las_file = header_las(text)
+    wrap = las_file.header["Version"].get("WRAP")
+    if wrap is not None and str(wrap.value).strip().upper() == "YES":
+        raise ValueError("Wrapped LAS files are not supported by the chunked reader")
+    return las_file, data_offset
+
+
+def _count_rows(f):
+    # Count data lines from the current position without keeping them
+    rows = 0
+    tail = b""
+    while True:
+        chunk = f.read(COUNT_CHUNK)
+        if not chunk:
+            break
+        rows += chunk.count(b"\n")
+        tail = chunk
+    if tail and not tail.endswith(b"\n"):
+        rows += 1
+    return rows
+
+
+def _parse_block(lines, ncols):
+    rows = [line for line in lines if line.strip() and not line.lstrip().startswith(b"#")]
+    with warnings.catch_warnings():
+        # fromstring stops at a non-numeric token with only a DeprecationWarning;
+        # the size check below catches the values it did not parse
+        warnings.simplefilter("ignore", DeprecationWarning)
+        values = np.fromstring(b" ".join(rows).decode("latin-1"), dtype=np.float64, sep=" ")
+    if values.size != len(rows) * ncols:
+        raise ValueError(
+            f"~A section has a row that does not match the {ncols} curves "
+            "in ~C (non-numeric or missing values)")
+    return values.reshape(-1, ncols)
+
+
+def _store_block(data, nrows, block):
+    # Copy a parsed (rows, curves) block into the column arrays
+    end = nrows + len(block)
+    if end > data.shape[1]:
+        raise ValueError("~A section has more rows than data lines (wrapped rows?)")
+    data[:, nrows:end] = block.T
+    return end
+
+
+def iter_data_blocks(source, block_rows=BLOCK_ROWS):
+    """
+    Yield ``(las_file, block)`` for each block of the ~A section.
+
+    ``block`` is a (rows, curves) float64 array of at most ``block_rows``
+    rows. Only one block is held in memory at a time.
+    """
+    f, owned = _open_binary(source)
+    try:
+        las_file, _ = read_header(f)
+        ncols = len(las_file.curves)
+        lines = []
+        for line in f:
+            lines.append(line)
+            if len(lines) == block_rows:
+                block = _parse_block(lines, ncols)
+                lines = []
+                if len(block):
+                    yield las_file, block
+        if lines:
+            block = _parse_block(lines, ncols)
+            if len(block):
+                yield las_file, block
+    finally:
+        if owned:
+            f.close()
+
+
+def read_las_chunked(source, block_rows=BLOCK_ROWS):
+    """
+    Read a LAS file in blocks and return a lasio LASFile whose curves hold
+    float64 arrays filled from the ~A section.
+
+    The data lines are counted first so every curve is preallocated once;
+    blocks are then parsed and copied into the column arrays.
+    """
+    f, owned = _open_binary(source)
+    try:
+        las_file, data_offset = read_header(f)
+        ncols = len(las_file.curves)
+        capacity = _count_rows(f)
+        f.seek(data_offset)
+
+        # Column-major storage: one contiguous array per curve
+        data = np.empty((ncols, capacity), dtype=np.float64)
+        nrows = 0
+        lines = []
+        for line in f:
+            lines.append(line)
+            if len(lines) == block_rows:
+                nrows = _store_block(data, nrows, _parse_block(lines, ncols))
+                lines = []
+        if lines:
+            nrows = _store_block(data, nrows, _parse_block(lines, ncols))
+    finally:
+        if owned:
+            f.close()
+
+    for i, curve in enumerate(las_file.curves):
+        curve.data = data[i, :nrows]
+    return las_file
@@ -0,0 +1,136 @@
+"""
+Matplotlib figures of the Log Visualization tab.
+
+The three-track log is sliced to the selected depth window and each curve
+is decimated to the pixel height of its track before plotting, so the
+rendering cost follows the screen resolution rather than the file length.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+
+import decimate
+import result_curves
+
+# Default values for visualization
+PLOT_H_FIG1 = 27
+PLOT_W_FIG1 = 22
+PLOT_H_FIG23 = 12
+PLOT_W_FIG23 = 16
+LINE_WIDTH = 1
+DT_COLOR = 'black'
+
+# Resolution the figures are rasterized at (the st.pyplot default), lowered
+# so that no image is wider than MAX_WIDTH pixels: st.image passes narrower
+# PNGs through as is but resizes and re-encodes wider ones on every rerun
+RENDER_DPI = 200
+MAX_WIDTH = 1460
+
+# Margin savefig adds around a tight bounding box (inches)
+PAD_INCHES = 0.1
+
+
+def render_dpi(width_inches):
+    """Resolution that rasterizes ``width_inches`` of figure into at most MAX_WIDTH pixels."""
+    return min(RENDER_DPI, MAX_WIDTH / width_inches)
+
+
+def _style_track(ax, label, left, right, grid_num, top_depth, bot_depth):
+    # Scale, ticks and grid shared by the three tracks
+    ax.set_xlabel(label)
+    ax.set_xlim(left, right)
+    ax.set_ylim(bot_depth, top_depth)
+    ax.xaxis.label.set_color(DT_COLOR)
+    ax.tick_params(axis='x', colors=DT_COLOR)
+    ax.spines["top"].set_edgecolor(DT_COLOR)
+    ax.spines["top"].set_position(("axes", 1.02))
+
+    # Ticks at both ends and in the middle of the scale
+    middle = (left + right) / 2
+    xtick_positions = [round(left, 2), round(middle, 2), round(right, 2)]
+    ax.set_xticks(xtick_positions)
+    ax.set_xticklabels([f"{x:.2f}" for x in xtick_positions])
+
+    # Grid lines
+    ax.set_xticks(np.linspace(left, right, num=grid_num), minor=True)
+    ax.grid(which='minor', linestyle='--', linewidth=0.5)
+    ax.grid(which='major', color='silver', linestyle='-')
+    ax.grid(which='minor', color='lightgrey', linestyle=':', axis='y')
+    ax.xaxis.set_ticks_position("top")
+    ax.xaxis.set_label_position("top")
+
+
+def plot_empty_tracks():
+    """Return the blank three-track figure shown when no curve can be plotted."""
+    fig, _ = plt.subplots(nrows=1, ncols=3, figsize=(PLOT_W_FIG1, PLOT_H_FIG1))
+    return fig
+
+
+def plot_log_tracks(frame, result_df, result_name, settings, index=None):
+    """
+    Return the three-track log figure: sonic log, sonic porosity and result.
+
+    ``settings`` holds the sidebar values (depth window, scales, number of
+    grids and the unit of the sonic curve). ``index`` is the DepthIndex of
+    the well the frames were derived from (row for row).
+    """
+    top_depth = settings["top_depth"]
+    bot_depth = settings["bot_depth"]
+    fig, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(PLOT_W_FIG1, PLOT_H_FIG1))
+
+    # One bin per pixel row of the rendered track (a bin gives a min and a max point);
+    # the tight bounding box is narrower than the figure, so this is an upper bound
+    n_bins = max(int(ax1.bbox.height * render_dpi(fig.get_figwidth()) / fig.dpi), 1)
+    porosity_columns = result_curves.porosity_columns(frame)
+    curves = decimate.decimate_frame(
+        frame, ['Sonic Log Reading'] + porosity_columns, 'Depth', top_depth, bot_depth, n_bins, index)
+    result = decimate.decimate_frame(
+        result_df, [result_name], 'Depth', top_depth, bot_depth, n_bins, index)
+
+    # Track 1: Sonic Log Reading
+    depth, values = curves['Sonic Log Reading']
+    ax1.plot(values, depth, color=DT_COLOR, lw=LINE_WIDTH)
+    _style_track(ax1, f'Sonic Log\n{settings["unit_curve"]}', settings["dt_left"],
+                 settings["dt_right"], settings["grid_num_1"], top_depth, bot_depth)
+
+    # Track 2: every porosity column
+    for column in porosity_columns:
+        depth, values = curves[column]
+        ax2.plot(values, depth, label=column)
+    _style_track(ax2, 'Sonic Porosity\np.u.', settings["phis_left"],
+                 settings["phis_right"], settings["grid_num_2"], top_depth, bot_depth)
+    ax2.legend()
+
+    # Track 3: result curve over the porosity bands
+    depth, values = result[result_name]
+    ax3.plot(values, depth, label=result_name, color=DT_COLOR)
+    band_depth = [min(top_depth, bot_depth), max(top_depth, bot_depth)]
+    for left, right, color, hatch in result_curves.RESULT_BANDS:
+        ax3.fill_betweenx(band_depth, left, right, interpolate=False, color=color,
+                          linewidth=0, alpha=0.5, hatch=hatch)
+    _style_track(ax3, 'Result\np.u.', settings["result_left"],
+                 settings["result_right"], settings["grid_num_3"], top_depth, bot_depth)
+    return fig
+
+
+def plot_depth_porosity(frame):
+    """Return the Depth vs Sonic Porosity figure."""
+    fig, ax = plt.subplots(figsize=(PLOT_W_FIG23, PLOT_H_FIG23))
+    for column in result_curves.porosity_columns(frame):
+        ax.plot(frame['Depth'], frame[column], label=column)
+    ax.set_xlabel('Depth')
+    ax.set_ylabel('Sonic Porosity')
+    ax.set_title('')
+    ax.legend()
+    return fig
+
+
+def plot_dt_porosity(frame):
+    """Return the Sonic Log Reading vs Sonic Porosity figure."""
+    fig, ax = plt.subplots(figsize=(PLOT_W_FIG23, PLOT_H_FIG23))
+    for column in result_curves.porosity_columns(frame):
+        ax.plot(frame['Sonic Log Reading'], frame[column], label=column)
+    ax.set_xlabel('Sonic Log Reading')
+    ax.set_ylabel('Sonic Porosity')
+    ax.set_title('')
+    ax.legend()
+    return fig
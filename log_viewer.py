@@ -0,0 +1,95 @@
+"""
+Interactive WebGL log viewer.
+
+Each curve gets a level-of-detail pyramid: level 0 is the raw curve and
+every next level halves it with a min/max envelope (so spikes survive at
+every level). For the visible depth range the server picks the finest level
+that fits the point budget and sends only that slice to the browser as
+Plotly Scattergl traces. Narrowing the Top/Bottom Depth window refines the
+level, so large logs stay responsive; Plotly's own zoom works on the slice.
+"""
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import decimate
+from depth_index import DepthIndex
+from lru import LRUCache
+from result_curves import RESULT_BANDS
+
+# Points sent to the browser per curve for the visible window
+MAX_POINTS = 4000
+
+# Pyramids are kept across reruns, keyed on the inputs of the curve
+pyramid_cache = LRUCache(max_entries=64, max_bytes=256 * 1024 * 1024,
+                         sizeof=lambda pyramid: pyramid.nbytes)
+
+
+class LodPyramid:
+    """Level-of-detail pyramid of one curve sampled along depth."""
+
+    def __init__(self, depth, values, min_points=MAX_POINTS):
+        depth = np.asarray(depth, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        self.levels = [(depth, values)]
+        # Each level is a min/max envelope of the previous one at half size
+        while len(self.levels[-1][0]) > min_points:
+            depth, values = self.levels[-1]
+            self.levels.append(decimate.minmax_envelope(depth, values, len(depth) // 4))
+        # Depth lookup of each level, so panning does not rescan the depths
+        self.indexes = [DepthIndex(depth) for depth, _ in self.levels]
+
+    @property
+    def nbytes(self):
+        return sum(depth.nbytes + values.nbytes for depth, values in self.levels)
+
+    def visible(self, top, bot, max_points=MAX_POINTS):
+        """Return the (depth, values) of the finest level fitting ``max_points`` in top..bot."""
+        for (depth, values), index in zip(self.levels, self.indexes):
+            window = decimate.depth_window(depth, top, bot, index)
+            count = window.stop - window.start if isinstance(window, slice) else window.sum()
+            if count <= max_points:
+                return depth[window], values[window]
+        depth, values = self.levels[-1]
+        window = decimate.depth_window(depth, top, bot, self.indexes[-1])
+        return depth[window], values[window]
+
+
+def get_pyramid(key, depth, values):
+    """Return the cached pyramid for ``key``, building it on a miss."""
+    return pyramid_cache.get_or_compute(key, lambda: LodPyramid(depth, values))
+
+
+def viewer_figure(tracks, settings, max_points=MAX_POINTS):
+    """
+    Build the three-track Plotly figure for the visible depth window.
+
+    ``tracks`` is a list of three lists of ``(name, pyramid, color)``
+    (sonic log, sonic porosity, result); ``settings`` holds the sidebar
+    depth window and scales, as for log_plot.plot_log_tracks.
+    """
+    top = min(settings["top_depth"], settings["bot_depth"])
+    bot = max(settings["top_depth"], settings["bot_depth"])
+    fig = make_subplots(rows=1, cols=3, shared_yaxes=True, horizontal_spacing=0.03,
+                        subplot_titles=[f'Sonic Log ({settings["unit_curve"]})',
+                                        'Sonic Porosity (p.u.)', 'Result (p.u.)'])
+
+    for col, curves in enumerate(tracks, start=1):
+        for name, pyramid, color in curves:
+            depth, values = pyramid.visible(top, bot, max_points)
+            fig.add_trace(go.Scattergl(x=values, y=depth, name=name, mode="lines",
+                                       line=dict(width=1, color=color)), row=1, col=col)
+
+    # Porosity bands of the result track
+    for left, right, color, _ in RESULT_BANDS:
+        fig.add_shape(type="rect", x0=left, x1=right, y0=top, y1=bot, fillcolor=color,
+                      opacity=0.3, line_width=0, layer="below", row=1, col=3)
+
+    for col, (left, right) in enumerate([
+            (settings["dt_left"], settings["dt_right"]),
+            (settings["phis_left"], settings["phis_right"]),
+            (settings["result_left"], settings["result_right"])], start=1):
+        fig.update_xaxes(range=[left, right], side="top", row=1, col=col)
+    fig.update_yaxes(range=[bot, top], title_text="Depth", row=1, col=1)
+    fig.update_layout(height=1100, legend=dict(orientation="h"), margin=dict(t=60, b=20))
+    return fig
@@ -0,0 +1,82 @@
+"""
+Thread-safe LRU cache bounded by entry count and total size in bytes.
+
+Streamlit serves every session from threads of one process, so caches kept
+at module level in an imported module are shared by all reruns and sessions.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def inputs_key(*inputs):
+    """Return a cache key (hex digest) for a tuple of repr-able inputs."""
+    return hashlib.blake2b(repr(inputs).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """
+    Least recently used cache. ``sizeof(value)`` gives the bytes charged for
+    each entry against ``max_bytes``.
+    """
+
+    def __init__(self, max_entries, max_bytes, sizeof=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            size = self.sizeof(value)
+            self._entries[key] = (value, size)
+            self._nbytes += size
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until both bounds hold. The newest
+        # entry is always kept, even if it alone exceeds the memory cap.
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._nbytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._nbytes -= size
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,81 @@
+"""
+Null-value masking at ingest.
+
+LAS files declare their null value in the ~W section (``NULL``), but many
+files use a different sentinel in the data (e.g. ``-9999.0000`` in a file
+declaring ``NULL -999.25``). Every curve is scanned once for the declared
+and the common de-facto sentinels, which are replaced by NaN so downstream
+steps work on clean float arrays.
+"""
+import numpy as np
+
+# Null sentinels found in the wild, besides the value declared in the header
+COMMON_NULLS = (-999.25, -999.0, -9999.0, -9999.25, -99999.0)
+
+# Relative distance to a sentinel still treated as null: resampling or unit
+# conversion leaves sentinels slightly off (e.g. -9998.8819 for -9999)
+NULL_TOLERANCE = 1e-4
+
+
+def declared_null(las_file):
+    """Return the NULL value declared in the ~W section, or None."""
+    try:
+        return float(las_file.header["Well"].NULL.value)
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return None
+
+
+def null_sentinels(declared=None):
+    """Return the array of values treated as null."""
+    sentinels = set(COMMON_NULLS)
+    if declared is not None:
+        sentinels.add(float(declared))
+    return np.array(sorted(sentinels))
+
+
+def mask_nulls(columns, declared=None, skip=("DEPTH",)):
+    """
+    Replace null sentinels with NaN in a dict of curve arrays.
+
+    A sample is null when it matches the declared or a common sentinel
+    within NULL_TOLERANCE. Other values, however negative (TVDSS,
+    elevation, SP), are kept.
+
+    Returns ``(masked, report)``: ``masked`` is a new dict where curves
+    without sentinels are the original arrays and the others are copies
+    with NaN; ``report`` maps each masked curve to ``{sentinel: count}``.
+    """
+    sentinels = null_sentinels(declared)
+    masked = {}
+    report = {}
+    for name, values in columns.items():
+        if name in skip:
+            masked[name] = values
+            continue
+        mask = np.zeros(len(values), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for sentinel in sentinels:
+                mask |= np.abs(values - sentinel) <= NULL_TOLERANCE * abs(sentinel)
+        if not mask.any():
+            masked[name] = values
+            continue
+        found, counts = np.unique(values[mask], return_counts=True)
+        report[name] = {float(s): int(c) for s, c in zip(found, counts)}
+        clean = np.array(values, dtype=np.float64)
+        clean[mask] = np.nan
+        masked[name] = clean
+    return masked, report
+
+
+def null_runs(values):
+    """Return the (start, stop) row pairs of the NaN runs of a curve as an (n, 2) array."""
+    missing = np.isnan(np.asarray(values, dtype=np.float64)).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], missing, [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    return np.column_stack([starts, stops])
+
+
+def null_runs_by_curve(columns, skip=("DEPTH",)):
+    """Return the null runs of every curve of a dict of column arrays."""
+    return {name: null_runs(values) for name, values in columns.items() if name not in skip}
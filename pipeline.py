@@ -0,0 +1,270 @@
+"""
+Headless sonic-porosity pipeline.
+
+load -> null-mask -> unit detect -> sonic QC -> porosity -> result curve
+-> evaluation -> export, as an importable library and a command-line tool. Nothing here
+imports Streamlit, matplotlib or missingno, so startup is fast and every
+stage can be benchmarked in isolation.
+
+    python pipeline.py LAS_1.las --correction "Oil Correction" --out LAS_1_porosity.csv
+"""
+import argparse
+import time
+
+import numpy as np
+
+import compaction
+import las_loader
+import porosity
+import result_curves
+import sonic_qc
+import zonation
+
+# Formation Evaluation findings, in the order the app reports them
+FINDINGS = {
+    "Negative": "Negative porosity value. Porosity should range between 0 to 1.",
+    "Anomaly": "More than 1 porosity value. Reading anomalies detected.",
+    "Overestimate": "Overestimate porosity value. Correction should be applied.",
+    "Normal": "Normal sonic porosity reading.",
+}
+
+
+class InterpretationSpec:
+    """Matrix/fluid models, correction and result curve of an interpretation."""
+
+    def __init__(self, models=None, correction="None", average=False,
+                 result_method="Max", curve=None, compaction=False, gr_curve=None,
+                 gr_cutoff=None, shale_window=compaction.SHALE_WINDOW,
+                 min_thickness=zonation.MIN_THICKNESS, despike=False,
+                 spike_window=sonic_qc.WINDOW, spike_threshold=sonic_qc.THRESHOLD):
+        self.models = list(porosity.MODELS if models is None else models)
+        self.correction = correction
+        self.average = average
+        self.result_method = result_method
+        # Sonic curve mnemonic; detected from the well when None
+        self.curve = curve
+        # Compaction correction: gamma-ray curve (detected when None), shale
+        # cutoff (midway between GR P5 and P95 when None), trend window
+        self.compaction = compaction
+        self.gr_curve = gr_curve
+        self.gr_cutoff = gr_cutoff
+        self.shale_window = shale_window
+        # Zones of the result curve thinner than this are merged
+        self.min_thickness = min_thickness
+        # Sonic QC window (samples) and threshold (robust sigmas); flagged
+        # samples are replaced by the rolling median when ``despike`` is set
+        self.despike = despike
+        self.spike_window = spike_window
+        self.spike_threshold = spike_threshold
+
+
+class PipelineResult:
+    """Output of the pipeline for one well, with the wall time of each stage."""
+
+    def __init__(self, well, curve, unit, frame, result_name, findings, zones, spikes, timings):
+        self.well = well
+        self.curve = curve
+        self.unit = unit
+        self.frame = frame
+        self.result_name = result_name
+        self.findings = findings
+        # Zone table of the result curve (see zonation.zone_table)
+        self.zones = zones
+        # Flagged cycle-skip and spike intervals (see sonic_qc.flagged_intervals)
+        self.spikes = spikes
+        self.timings = timings
+
+    @property
+    def well_name(self):
+        return self.well.header.get("Well", {}).get("WELL") or "unknown"
+
+
+def load(source):
+    """Parse a LAS file (path or raw bytes); null sentinels are masked at ingest."""
+    if isinstance(source, str):
+        return las_loader.parse_las_path(source)
+    return las_loader.parse_las(source)
+
+
+def detect_unit(unit):
+    """Map the unit of the sonic curve to the unit system of the porosity engine."""
+    return "US/M" if str(unit).upper() == "US/M" else "US/FT"
+
+
+def run(source, spec=None):
+    """Run every stage of the pipeline on one well and return a PipelineResult."""
+    spec = spec or InterpretationSpec()
+    timings = {}
+
+    start = time.perf_counter()
+    well = source if isinstance(source, las_loader.ParsedWell) else load(source)
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    curve = spec.curve or well.sonic_curve()
+    if curve is None or curve not in well.columns:
+        raise ValueError(f"No sonic curve found (looked for {spec.curve or 'DT'})")
+    unit = well.curve_unit(curve)
+    timings["unit"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    depth, dt = well.columns["DEPTH"], well.columns[curve]
+    flags, median = sonic_qc.detect(dt, spec.spike_window, spec.spike_threshold, detect_unit(unit))
+    spikes = sonic_qc.flagged_intervals(depth, dt, flags, median)
+    if spec.despike:
+        dt = sonic_qc.despike(dt, flags, median)
+    timings["qc"] = time.perf_counter() - start
+
+    cp = None
+    if spec.compaction:
+        start = time.perf_counter()
+        gr = spec.gr_curve or compaction.gamma_ray_curve(well)
+        if gr is None or gr not in well.columns:
+            raise ValueError(f"No gamma-ray curve found (looked for {spec.gr_curve or 'GR'})")
+        cutoff = compaction.default_cutoff(well.columns[gr]) if spec.gr_cutoff is None else spec.gr_cutoff
+        cp = compaction.compaction_factor(depth, dt, well.columns[gr], cutoff, spec.shale_window,
+                                          detect_unit(unit))
+        timings["compaction"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = porosity.porosity_frame(
+        depth, dt, spec.models,
+        correction=spec.correction, unit=detect_unit(unit), average=spec.average, compaction=cp)
+    timings["porosity"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result_name = result_curves.result_name(spec.result_method)
+    frame[result_name] = result_curves.result_curve(frame, spec.result_method)
+    timings["result"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    findings = zonation.findings(frame[result_name].to_numpy())
+    zones = zonation.zone_table(frame["Depth"].to_numpy(), frame[result_name].to_numpy(), spec.min_thickness)
+    timings["evaluation"] = time.perf_counter() - start
+
+    return PipelineResult(well, curve, unit, frame, result_name, findings, zones, spikes, timings)
+
+
+def summarize(result):
+    """Return a one-row summary dict of a PipelineResult."""
+    values = result.frame[result.result_name].to_numpy()
+    valid = ~np.isnan(values)
+    summary = {
+        "Well": result.well_name,
+        "Curve": result.curve,
+        "Unit": result.unit,
+        "Samples": len(values),
+        "Valid Samples": int(np.count_nonzero(valid)),
+        f"Mean {result.result_name}": float(values[valid].mean()) if valid.any() else np.nan,
+    }
+    summary.update(result_curves.category_counts(values))
+    return summary
+
+
+def export(result, path, top=None, bottom=None):
+    """
+    Write the porosity and result columns of a PipelineResult to CSV,
+    optionally only the rows between the ``top`` and ``bottom`` depths.
+    """
+    start = time.perf_counter()
+    frame = result.frame
+    if top is not None or bottom is not None:
+        index = result.well.depth_index
+        top = -np.inf if top is None else top
+        bottom = np.inf if bottom is None else bottom
+        frame = frame[index.window(top, bottom)]
+    frame.to_csv(path, index=False)
+    result.timings["export"] = time.perf_counter() - start
+
+
+def parse_model(text):
+    """Parse a ``Matrix:Fluid`` command-line argument into a model tuple."""
+    matrix, _, fluid = text.partition(":")
+    model = (matrix.strip().capitalize(), fluid.strip().capitalize())
+    if model not in porosity.MODELS:
+        raise argparse.ArgumentTypeError(
+            f"unknown model {text!r}; use Matrix:Fluid, e.g. Sandstone:Seawater")
+    return model
+
+
+def add_spec_arguments(parser):
+    """Add the InterpretationSpec options to a command-line parser."""
+    parser.add_argument("--models", nargs="+", type=parse_model, default=None,
+                        help="Matrix:Fluid pairs (default: all six)")
+    parser.add_argument("--correction", choices=list(porosity.HC_CORRECTION), default="None")
+    parser.add_argument("--average", action="store_true", help="add the Average Porosity column")
+    parser.add_argument("--result", default="Max", choices=list(result_curves.RESULT_METHODS))
+    parser.add_argument("--curve", default=None, help="sonic curve mnemonic (default: detect)")
+    parser.add_argument("--compaction", action="store_true",
+                        help="divide porosity by the compaction factor Cp of the GR shale trend")
+    parser.add_argument("--gr-curve", default=None, help="gamma-ray curve mnemonic (default: detect)")
+    parser.add_argument("--gr-cutoff", type=float, default=None,
+                        help="shale gamma-ray cutoff (default: midway between P5 and P95)")
+    parser.add_argument("--shale-window", type=float, default=compaction.SHALE_WINDOW,
+                        help="depth window of the shale DT trend")
+    parser.add_argument("--min-thickness", type=float, default=zonation.MIN_THICKNESS,
+                        help="merge result-curve zones thinner than this depth interval")
+    parser.add_argument("--despike", action="store_true",
+                        help="replace flagged cycle skips and spikes by the rolling median")
+    parser.add_argument("--spike-window", type=int, default=sonic_qc.WINDOW,
+                        help="sonic QC rolling window (samples)")
+    parser.add_argument("--spike-threshold", type=float, default=sonic_qc.THRESHOLD,
+                        help="sonic QC threshold (robust standard deviations)")
+
+
+def spec_from_args(args):
+    return InterpretationSpec(args.models, args.correction, args.average, args.result, args.curve,
+                              args.compaction, args.gr_curve, args.gr_cutoff, args.shale_window,
+                              args.min_thickness, args.despike, args.spike_window, args.spike_threshold)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sonic porosity interpretation of one LAS file.")
+    parser.add_argument("las", help="LAS file")
+    add_spec_arguments(parser)
+    parser.add_argument("--out", default=None, help="CSV file for the porosity results")
+    parser.add_argument("--top", type=float, default=None, help="export from this depth")
+    parser.add_argument("--bottom", type=float, default=None, help="export down to this depth")
+    parser.add_argument("--zones", default=None, help="CSV file for the zone table")
+    parser.add_argument("--spikes", default=None, help="CSV file for the flagged sonic intervals")
+    parser.add_argument("--timings", action="store_true", help="print the wall time of each stage")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run(args.las, spec_from_args(args))
+    except (OSError, ValueError) as e:
+        # Missing file or curve: a usage error, not a traceback
+        parser.error(str(e))
+    if args.out:
+        export(result, args.out, args.top, args.bottom)
+    if args.zones:
+        result.zones.to_csv(args.zones, index=False)
+    if args.spikes:
+        result.spikes.to_csv(args.spikes, index=False)
+
+    for key, value in summarize(result).items():
+        print(f"{key:<16}: {value}")
+    print("Findings:")
+    for finding in result.findings:
+        print(f"  - {FINDINGS[finding]}")
+    print(f"Zones: {len(result.zones)}")
+    for category, count in result.zones["Category"].value_counts().items():
+        print(f"  {category:<14}{count:>6}")
+    print(f"Flagged sonic intervals: {len(result.spikes)}"
+          + (" (despiked)" if args.despike else ""))
+    for kind, count in result.spikes["Kind"].value_counts().items():
+        print(f"  {kind:<14}{count:>6}")
+    if args.out:
+        print(f"Results written to {args.out}")
+    if args.zones:
+        print(f"Zones written to {args.zones}")
+    if args.spikes:
+        print(f"Flagged intervals written to {args.spikes}")
+    if args.timings:
+        print("Timings:")
+        for stage, seconds in result.timings.items():
+            print(f"  {stage:<12}{seconds * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
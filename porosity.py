@@ -0,0 +1,103 @@
+"""
+Sonic porosity engine.
+
+Wyllie time average porosity for every selected matrix/fluid pair, computed
+in a single NumPy broadcast over the whole DT curve instead of one Python
+dict per depth sample.
+"""
+import numpy as np
+import pandas as pd
+
+# Interval transit times in μsec/ft
+DT_MATRIX = {
+    "Sandstone": 55.5,
+    "Limestone": 47.5,
+    "Dolomite": 43.5,
+}
+DT_FLUID = {
+    "Seawater": 189,
+    "Freshwater": 204,
+}
+
+# Hydrocarbon correction factor (Hy) for each option of the sidebar radio
+HC_CORRECTION = {
+    "None": 1.0,
+    "Oil Correction": 0.9,
+    "Gas Correction": 0.7,
+}
+
+# Factor applied to the μsec/ft values when the curve is recorded in μsec/m
+METER_FACTOR = 12 * 2.54 * 0.01
+
+# Matrix/fluid pairs in the order they are offered in the sidebar
+MODELS = [
+    ("Sandstone", "Seawater"),
+    ("Limestone", "Seawater"),
+    ("Dolomite", "Seawater"),
+    ("Sandstone", "Freshwater"),
+    ("Limestone", "Freshwater"),
+    ("Dolomite", "Freshwater"),
+]
+
+
+def model_label(matrix, fluid):
+    # Label used for the sidebar checkbox
+    return f"Matrix: {matrix} | Fluid: {fluid}"
+
+
+def column_name(matrix, fluid):
+    # Name of the porosity column in the data sets table
+    return f"Sonic_{matrix}_{fluid}"
+
+
+def transit_times(unit="US/FT"):
+    """Return the (matrix, fluid) transit time dicts for the given curve unit."""
+    factor = METER_FACTOR if str(unit).upper() == "US/M" else 1.0
+    matrix = {name: value * factor for name, value in DT_MATRIX.items()}
+    fluid = {name: value * factor for name, value in DT_FLUID.items()}
+    return matrix, fluid
+
+
+def compute_porosity(dt, models, correction="None", unit="US/FT", dtype=np.float64, compaction=None):
+    """
+    Compute sonic porosity for every (matrix, fluid) pair in ``models``.
+
+    ``dt`` is the sonic curve as any array-like. Returns a dict mapping the
+    porosity column name to an array of ``dtype`` (float64, or float32 in
+    compact mode) with the same length as ``dt``. All columns are evaluated
+    in one broadcast of shape (models, samples). ``compaction`` is an
+    optional per-sample compaction factor (Cp) every column is divided by.
+    """
+    dt = np.asarray(dt, dtype=dtype)
+    models = list(models)
+    if not models:
+        return {}
+
+    matrix, fluid = transit_times(unit)
+    dt_ma = np.array([matrix[m] for m, _ in models], dtype=dtype)
+    dt_fl = np.array([fluid[f] for _, f in models], dtype=dtype)
+    # Fold the hydrocarbon correction into the per-model scale factor
+    scale = HC_CORRECTION[correction] / (dt_fl - dt_ma)
+
+    phi = (dt[np.newaxis, :] - dt_ma[:, np.newaxis]) * scale[:, np.newaxis]
+    if compaction is not None:
+        phi /= np.asarray(compaction, dtype=dtype)[np.newaxis, :]
+    return {column_name(m, f): phi[i] for i, (m, f) in enumerate(models)}
+
+
+def porosity_frame(depth, dt, models, correction="None", unit="US/FT", average=False, compaction=None):
+    """
+    Build the Interpretation tab data set: Depth, Sonic Log Reading, one
+    column per selected model and, optionally, the Average Porosity.
+    """
+    columns = {
+        "Depth": np.asarray(depth, dtype=np.float64),
+        "Sonic Log Reading": np.asarray(dt, dtype=np.float64),
+    }
+    porosity = compute_porosity(dt, models, correction, unit, compaction=compaction)
+    columns.update(porosity)
+    frame = pd.DataFrame(columns)
+
+    if average:
+        frame["Average Porosity"] = frame[list(porosity)].mean(axis=1)
+    return frame
@@ -0,0 +1,46 @@
+"""
+PDF report of the Log Visualization tab.
+
+The report is rendered into a memory buffer only when a session asks for
+it, and kept in an LRU cache keyed on every input of the figures (file
+hash, curve, models, correction, result curve, depth window and scales).
+Sessions never share a file on disk, and asking again for the same report
+is a cache hit.
+"""
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+import log_plot
+from lru import LRUCache
+
+# Bounds of the shared report cache
+MAX_ENTRIES = 16
+MAX_BYTES = 128 * 1024 * 1024
+
+report_cache = LRUCache(MAX_ENTRIES, MAX_BYTES)
+
+
+def render_report(frame, result_df, result_name, settings, index=None):
+    """Render the three Log Visualization figures into PDF bytes."""
+    figures = [
+        log_plot.plot_log_tracks(frame, result_df, result_name, settings, index),
+        log_plot.plot_depth_porosity(frame),
+        log_plot.plot_dt_porosity(frame),
+    ]
+    buffer = BytesIO()
+    try:
+        with PdfPages(buffer) as pdf_pages:
+            for fig in figures:
+                pdf_pages.savefig(fig)
+    finally:
+        for fig in figures:
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+def get_report(key, frame, result_df, result_name, settings, index=None):
+    """Return the PDF bytes for ``key``, rendering them on a cache miss."""
+    return report_cache.get_or_compute(
+        key, lambda: render_report(frame, result_df, result_name, settings, index))
@@ -0,0 +1,121 @@
+"""
+Result curves for Track 3 and Formation Evaluation.
+
+The result curve is derived from the porosity columns with NaN-aware
+columnar reductions (one pass over a (columns, samples) array) instead of
+scanning the data set row by row.
+"""
+import numpy as np
+import pandas as pd
+
+# Reductions offered for the result curve
+RESULT_METHODS = ("Max", "Min", "Average")
+
+# Columns of the data set that are not porosity columns
+BASE_COLUMNS = ("Depth", "Sonic Log Reading")
+
+# Formation Evaluation categories of the result curve: (name, lower, upper),
+# each covering lower <= value < upper
+CATEGORIES = [
+    ("Negative", -np.inf, 0.0),
+    ("Normal", 0.0, 0.467),
+    ("Overestimate", 0.467, 1.0),
+    ("Anomaly", 1.0, np.inf),
+]
+
+# Porosity bands of the result track: (left, right, color, hatch)
+RESULT_BANDS = [
+    (-0.15, 0, 'orange', '=-'),
+    (0, 0.467, 'green', 'b'),
+    (0.467, 1, 'gold', 'o'),
+    (1, 1.51, 'red', 'x'),
+]
+
+
+def porosity_columns(frame):
+    """Return the porosity column names of an Interpretation data set."""
+    return [col for col in frame.columns if col not in BASE_COLUMNS]
+
+
+def result_name(method):
+    # Column name of the result curve, e.g. "Max Value"
+    return method if method not in RESULT_METHODS else f"{method} Value"
+
+
+def _stack(frame, columns):
+    return np.vstack([frame[col].to_numpy(dtype=np.float64) for col in columns])
+
+
+def result_curve(frame, method="Max"):
+    """
+    Reduce the porosity columns of ``frame`` to a single result curve.
+
+    ``method`` is one of RESULT_METHODS or the name of a porosity column,
+    in which case that model is used as is. NaN samples are ignored; a row
+    without any valid porosity yields NaN.
+    """
+    if method not in RESULT_METHODS:
+        return frame[method].to_numpy(dtype=np.float64)
+
+    columns = porosity_columns(frame)
+    if not columns:
+        return np.full(len(frame), np.nan)
+
+    values = _stack(frame, columns)
+    if method == "Max":
+        return np.fmax.reduce(values, axis=0)
+    if method == "Min":
+        return np.fmin.reduce(values, axis=0)
+
+    # NaN-aware mean without the all-NaN RuntimeWarning of np.nanmean
+    valid = ~np.isnan(values)
+    total = np.where(valid, values, 0.0).sum(axis=0)
+    count = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def result_frame(frame, method="Max"):
+    """Return a DataFrame with Depth and the named result curve."""
+    return pd.DataFrame({
+        "Depth": frame["Depth"].to_numpy(),
+        result_name(method): result_curve(frame, method),
+    })
+
+
+def interval_statistics(values, starts, stops):
+    """
+    Return the sample count, mean, minimum and maximum of ``values`` over
+    each row interval ``starts[i]:stops[i]``, ignoring NaN. Intervals
+    without a valid sample get NaN statistics.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.intp)
+    stops = np.asarray(stops, dtype=np.intp)
+    valid = ~np.isnan(values)
+    # Prefix sums give every interval sum and count in one step
+    total = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    count = np.concatenate(([0], np.cumsum(valid)))
+    n = count[stops] - count[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, (total[stops] - total[starts]) / n, np.nan)
+
+    # reduceat needs non-empty intervals in range; others are masked afterwards
+    nonempty = stops > starts
+    low = np.full(len(starts), np.nan)
+    high = np.full(len(starts), np.nan)
+    if nonempty.any():
+        bounds = np.column_stack([starts[nonempty], stops[nonempty]]).ravel()
+        padded = np.append(values, np.nan)
+        low[nonempty] = np.fmin.reduceat(padded, bounds)[::2]
+        high[nonempty] = np.fmax.reduceat(padded, bounds)[::2]
+    return pd.DataFrame({"Samples": n, "Mean": mean, "Min": low, "Max": high})
+
+
+def category_counts(values):
+    """Return the number of samples of the result curve in each category."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    edges = [lower for _, lower, _ in CATEGORIES[1:]]
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(CATEGORIES))
+    return {name: int(count) for (name, _, _), count in zip(CATEGORIES, counts)}
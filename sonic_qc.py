@@ -0,0 +1,113 @@
+"""
+Cycle-skip and spike detection on the sonic curve.
+
+A sample is flagged when it departs from the rolling median of its window by
+more than ``threshold`` robust standard deviations (1.4826 x the rolling
+median absolute deviation). The windows are strided views of the NaN-padded
+curve, so the median and MAD of every window come from two reductions over
+a (samples, window) view instead of a Python loop. Excursions towards slower
+readings (DT above the median) are reported as cycle skips, the others as
+spikes. Flagged samples can be replaced by the rolling median before the
+porosity is computed.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from porosity import METER_FACTOR
+from zonation import runs, sample_edges
+
+# Rolling window (samples, odd) and flagging threshold (robust sigmas)
+WINDOW = 11
+THRESHOLD = 4.0
+
+# Scale of the MAD to a standard deviation for normally distributed noise
+MAD_SCALE = 1.4826
+
+# Smallest deviation ever flagged, in μsec/ft, so flat stretches of the log
+# (MAD of zero) do not flag every rounding step
+MIN_DEVIATION = 2.0
+
+KINDS = ("Spike", "Cycle Skip")
+
+
+def rolling_windows(values, window):
+    """
+    Return a read-only ``(samples, window)`` view of the windows centred on
+    every sample, the curve padded with NaN at both ends.
+    """
+    half = window // 2
+    padded = np.concatenate((np.full(half, np.nan), np.asarray(values, dtype=np.float64), np.full(half, np.nan)))
+    return sliding_window_view(padded, 2 * half + 1)
+
+
+def _window_median(windows):
+    # Plain median (partition) for complete windows; the NaN-aware one only
+    # for the few windows touching a null interval or an end of the log
+    median = np.median(windows, axis=1)
+    partial = np.isnan(median)
+    if partial.any():
+        with warnings.catch_warnings():
+            # All-NaN windows (inside null intervals) are expected and give NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median[partial] = np.nanmedian(windows[partial], axis=1)
+    return median
+
+
+def rolling_median_mad(values, window=WINDOW):
+    """Return the rolling median and median absolute deviation, ignoring NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return np.empty(0), np.empty(0)
+    windows = rolling_windows(values, window)
+    median = _window_median(windows)
+    mad = _window_median(np.abs(windows - median[:, np.newaxis]))
+    return median, mad
+
+
+def detect(dt, window=WINDOW, threshold=THRESHOLD, unit="US/FT"):
+    """
+    Return ``(flags, median)``: the flag of every sample (0 clean, 1 spike,
+    2 cycle skip, index into KINDS plus one) and the rolling median.
+    """
+    dt = np.asarray(dt, dtype=np.float64)
+    if np.isnan(dt).all():
+        # Empty or all-null curve: nothing to flag
+        return np.zeros(len(dt), dtype=np.int8), np.full(len(dt), np.nan)
+    median, mad = rolling_median_mad(dt, window)
+    floor = MIN_DEVIATION / METER_FACTOR if str(unit).upper() == "US/M" else MIN_DEVIATION
+    deviation = dt - median
+    with np.errstate(invalid="ignore"):
+        flagged = np.abs(deviation) > np.maximum(threshold * MAD_SCALE * mad, floor)
+        flags = np.where(flagged, np.where(deviation > 0, 2, 1), 0).astype(np.int8)
+    return flags, median
+
+
+def despike(dt, flags, median):
+    """Return ``dt`` with every flagged sample replaced by the rolling median."""
+    dt = np.asarray(dt, dtype=np.float64)
+    return np.where(flags > 0, median, dt)
+
+
+def flagged_intervals(depth, dt, flags, median):
+    """
+    Return the runs of flagged samples as a DataFrame with Top, Base,
+    Samples, Kind and Max Deviation (largest |DT - median| of the run).
+    """
+    starts, stops, kinds = runs(flags)
+    keep = kinds > 0
+    starts, stops, kinds = starts[keep], stops[keep], kinds[keep]
+    edges = sample_edges(depth)
+    deviation = np.abs(np.asarray(dt, dtype=np.float64) - median)
+    # Pad so reduceat never reads past the end; every run is non-empty
+    peak = np.fmax.reduceat(np.append(deviation, np.nan), np.column_stack([starts, stops]).ravel())[::2] \
+        if len(starts) else np.empty(0)
+    return pd.DataFrame({
+        "Top": np.minimum(edges[starts], edges[stops]),
+        "Base": np.maximum(edges[starts], edges[stops]),
+        "Samples": stops - starts,
+        "Kind": np.array(KINDS, dtype=object)[kinds - 1],
+        "Max Deviation": peak,
+    })
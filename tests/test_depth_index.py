@@ -0,0 +1,91 @@
+"""Tests of the depth-to-row lookup against a brute-force mask."""
+import numpy as np
+import pytest
+
+from depth_index import DepthIndex, RegularDepth, regular_depth
+
+rng = np.random.default_rng(0)
+
+
+def brute_force(depth, top, bot):
+    # (start, stop) of the samples within [top, bot] of a monotonic log
+    rows = np.where((depth >= min(top, bot)) & (depth <= max(top, bot)))[0]
+    if not len(rows):
+        return None
+    return int(rows[0]), int(rows[-1]) + 1
+
+
+def as_bounds(start, stop):
+    return (start, stop) if stop > start else None
+
+
+def intervals(depth):
+    # Random windows, windows on samples, reversed, partly and fully out of range
+    low, high = float(np.min(depth)), float(np.max(depth))
+    span = high - low
+    pairs = [tuple(rng.uniform(low - 0.2 * span, high + 0.2 * span, 2)) for _ in range(200)]
+    pairs += [(depth[i], depth[j]) for i, j in rng.integers(0, len(depth), (50, 2))]
+    pairs += [
+        (high, low), (low, high), (low - 10, low - 1), (high + 1, high + 10),
+        (low - 10, low), (high, high + 10), (-np.inf, np.inf), (low - 5, high + 5),
+    ]
+    return pairs
+
+
+DEPTHS = {
+    "regular": np.arange(1000.0, 1500.0, 0.5),
+    "regular_decreasing": np.arange(1500.0, 1000.0, -0.5),
+    "rounded": np.round(1000.0 + 0.1524 * np.arange(3000), 4),
+    "irregular": np.cumsum(rng.uniform(0.05, 2.0, 2000)) + 500.0,
+    "irregular_decreasing": 3000.0 - np.cumsum(rng.uniform(0.05, 2.0, 2000)),
+}
+
+
+@pytest.mark.parametrize("name", sorted(DEPTHS))
+def test_window_matches_brute_force(name):
+    depth = DEPTHS[name]
+    index = DepthIndex(depth)
+    for top, bot in intervals(depth):
+        window = index.window(top, bot)
+        assert as_bounds(window.start, window.stop) == brute_force(depth, top, bot), (top, bot)
+
+
+@pytest.mark.parametrize("name", sorted(DEPTHS))
+def test_slices_match_brute_force(name):
+    depth = DEPTHS[name]
+    tops, bots = zip(*intervals(depth))
+    starts, stops = DepthIndex(depth).slices(tops, bots)
+    for top, bot, start, stop in zip(tops, bots, starts, stops):
+        assert as_bounds(start, stop) == brute_force(depth, top, bot), (top, bot)
+
+
+def test_implicit_regular_depth_matches_brute_force():
+    grid = RegularDepth(2000.0, -0.25, 4000)
+    depth = grid.values()
+    index = DepthIndex(grid)
+    tops, bots = zip(*intervals(depth))
+    starts, stops = index.slices(tops, bots)
+    for top, bot, start, stop in zip(tops, bots, starts, stops):
+        expected = brute_force(depth, top, bot)
+        assert as_bounds(start, stop) == expected, (top, bot)
+        window = index.window(top, bot)
+        assert as_bounds(window.start, window.stop) == expected, (top, bot)
+
+
+def test_window_margin_is_clipped_to_the_log():
+    index = DepthIndex(DEPTHS["regular"])
+    assert index.window(1000.0, 1001.0, margin=5) == slice(0, 8)
+    assert index.window(1499.0, 1499.5, margin=5) == slice(993, 1000)
+
+
+def test_irregular_steps_are_not_regular():
+    assert regular_depth(DEPTHS["irregular"]) is None
+    assert regular_depth(DEPTHS["rounded"]) is not None
+
+
+def test_non_monotonic_window_is_a_mask_and_slices_raise():
+    depth = np.array([100.0, 101.0, 100.5, 102.0, 101.5])
+    index = DepthIndex(depth)
+    np.testing.assert_array_equal(index.window(101.2, 100.4), (depth >= 100.4) & (depth <= 101.2))
+    with pytest.raises(ValueError):
+        index.slices([100.0], [101.0])
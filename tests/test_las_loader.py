@@ -0,0 +1,16 @@
+"""Ingest tests of las_loader: both readers mask the same null sentinels."""
+import os
+
+import las_loader
+import las_reader
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Sample.las")
+
+
+def test_lasio_and_chunked_paths_report_the_same_nulls():
+    with open(SAMPLE, "rb") as f:
+        data = f.read()
+    lasio_well = las_loader.parse_las(data, key="lasio")
+    chunked_well = las_loader.ParsedWell("chunked", las_reader.read_las_chunked(data))
+    assert lasio_well.null_report
+    assert lasio_well.null_report == chunked_well.null_report
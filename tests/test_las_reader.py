@@ -0,0 +1,31 @@
+"""Regression tests of the chunked ~A reader."""
+import numpy as np
+import pytest
+
+import las_reader
+
+HEADER = b"""~Version
+VERS.   2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0
+WRAP.   NO  : One line per depth step
+~Well
+NULL.   -999.25 : NULL VALUE
+~Curve
+DEPT.M      : Depth
+DT  .US/FT  : Sonic
+~A
+"""
+
+
+def test_chunked_reader_matches_rows():
+    las_file = las_reader.read_las_chunked(HEADER + b"100.0 80.0\n100.5 81.0\n\n101.0 82.0\n")
+    np.testing.assert_array_equal(las_file.curves["DT"].data, [80.0, 81.0, 82.0])
+
+
+def test_non_numeric_token_at_row_boundary_is_rejected():
+    # fromstring stops at "bad" with only a warning; the rows after it must not vanish
+    data = HEADER + b"100.0 80.0\nbad 81.0\n101.0 82.0\n101.5 83.0\n"
+    with pytest.raises(ValueError):
+        las_reader.read_las_chunked(data)
+    with pytest.raises(ValueError):
+        list(las_reader.iter_data_blocks(data))
+
@@ -0,0 +1,66 @@
+"""Tests of the Formation Evaluation zonation."""
+import numpy as np
+
+import zonation
+
+# One representative value per category: Negative, Normal, Overestimate, Anomaly
+NEG, NORMAL, OVER, ANOMALY = -0.1, 0.2, 0.7, 1.2
+
+
+def test_classify_codes_every_category_and_null():
+    codes = zonation.classify([NEG, NORMAL, OVER, ANOMALY, np.nan, 0.0, 0.467, 1.0])
+    np.testing.assert_array_equal(codes, [0, 1, 2, 3, zonation.NULL, 1, 2, 3])
+
+
+def test_merge_thin_takes_the_zone_above():
+    codes = np.array([1] * 10 + [2] * 2 + [1] * 10)
+    edges = zonation.sample_edges(np.arange(len(codes), dtype=float))
+    merged = zonation.merge_thin(codes, edges, min_thickness=5)
+    np.testing.assert_array_equal(merged, [1] * 22)
+
+
+def test_merge_thin_at_the_top_takes_the_zone_below():
+    codes = np.array([3] * 2 + [1] * 10)
+    edges = zonation.sample_edges(np.arange(len(codes), dtype=float))
+    np.testing.assert_array_equal(zonation.merge_thin(codes, edges, 5), [1] * 12)
+
+
+def test_merge_thin_does_not_cross_null_intervals():
+    null = zonation.NULL
+    codes = np.array([1] * 10 + [null] + [2] * 2 + [null] + [3] * 2 + [1] * 10)
+    edges = zonation.sample_edges(np.arange(len(codes), dtype=float))
+    merged = zonation.merge_thin(codes, edges, 5)
+    # Between two nulls the thin zone stays; after a null it takes the zone below
+    np.testing.assert_array_equal(merged, [1] * 10 + [null] + [2] * 2 + [null] + [1] * 12)
+
+
+def test_zone_table_tops_and_bases():
+    depth = np.arange(100.0, 130.0, 1.0)
+    values = np.array([NORMAL] * 10 + [np.nan] * 5 + [ANOMALY] * 15)
+    table = zonation.zone_table(depth, values, min_thickness=0)
+    np.testing.assert_allclose(table["Top"], [99.5, 114.5])
+    np.testing.assert_allclose(table["Base"], [109.5, 129.5])
+    np.testing.assert_allclose(table["Thickness"], [10.0, 15.0])
+    np.testing.assert_allclose(table["Mean Porosity"], [NORMAL, ANOMALY])
+    assert list(table["Category"]) == ["Normal", "Anomaly"]
+
+
+def test_zone_table_of_a_depth_decreasing_log():
+    depth = np.arange(130.0, 100.0, -1.0)
+    values = np.array([OVER] * 20 + [NORMAL] * 10)
+    table = zonation.zone_table(depth, values)
+    np.testing.assert_allclose(table["Top"], [110.5, 100.5])
+    np.testing.assert_allclose(table["Base"], [130.5, 110.5])
+
+
+def test_findings_report_thin_problems_merged_out_of_the_zones():
+    values = np.array([NORMAL] * 20 + [NEG] + [NORMAL] * 20 + [OVER] * 2 + [np.nan])
+    table = zonation.zone_table(np.arange(len(values), dtype=float), values)
+    assert list(table["Category"]) == ["Normal"]
+    assert zonation.findings(values) == ["Negative", "Overestimate"]
+
+
+def test_findings_of_normal_and_empty_curves():
+    assert zonation.findings([NORMAL, NORMAL, np.nan]) == ["Normal"]
+    assert zonation.findings([np.nan, np.nan]) == []
+    assert zonation.findings([ANOMALY, NEG]) == ["Negative", "Anomaly"]
@@ -0,0 +1,149 @@
+"""
+On-disk binary cache of parsed wells.
+
+Every parsed well is written once to a local cache directory as one ``.npy``
+file per curve (the null-masked column arrays) plus ``well.json`` holding
+the LAS header text, the curve files and the null report. Reloading maps the
+arrays with ``np.load(mmap_mode="r")`` instead of re-parsing the ASCII file,
+so a well seen before opens in milliseconds, and the pages are shared by
+every session and process reading it through the OS page cache.
+
+The directory is ``$SONIC_WELL_CACHE`` (``~/.cache/sonic-log-interpreter/wells``
+by default); setting it to an empty string disables the store.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Bumped whenever the layout of a stored well, or the null masking applied
+# to its columns, changes (2: sentinel matching without a null floor,
+# 3: null report of lasio-parsed wells no longer emptied by lasio's policy)
+FORMAT_VERSION = 3
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sonic-log-interpreter", "wells")
+
+# Stored wells are pruned, least recently used first, above this total size
+MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+META_FILE = "well.json"
+RUNS_FILE = "null_runs.npz"
+
+
+def store_dir():
+    """Return the cache directory, or None when the store is disabled."""
+    path = os.environ.get("SONIC_WELL_CACHE", DEFAULT_DIR)
+    return path or None
+
+
+def _well_dir(key):
+    root = store_dir()
+    return None if root is None else os.path.join(root, key)
+
+
+def save(key, header_text, columns, null_report, null_runs):
+    """
+    Write a parsed well under its content key. Returns True when stored.
+
+    The well is written to a private directory that is renamed into place,
+    so readers never see a partial well; if another process stored the same
+    key first, its copy is kept. Disk errors only disable the store.
+    """
+    root = store_dir()
+    if root is None:
+        return False
+    target = os.path.join(root, key)
+    if os.path.isdir(target):
+        return True
+    try:
+        os.makedirs(root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{key}-", dir=root)
+        try:
+            files = []
+            for i, (name, values) in enumerate(columns.items()):
+                filename = f"{i:04d}.npy"
+                np.save(os.path.join(staging, filename), np.ascontiguousarray(values))
+                files.append([name, filename])
+            np.savez(os.path.join(staging, RUNS_FILE),
+                     **{f"{i:04d}": null_runs[name] for i, name in enumerate(columns)
+                        if name in null_runs})
+            meta = {
+                "version": FORMAT_VERSION,
+                "key": key,
+                "header": header_text,
+                "columns": files,
+                "null_report": {curve: [[sentinel, count] for sentinel, count in found.items()]
+                                for curve, found in null_report.items()},
+            }
+            with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.rename(staging, target)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(target):
+                raise
+        prune(root)
+        return True
+    except OSError:
+        return False
+
+
+def load(key):
+    """
+    Return the stored well for a content key as a dict (``header`` text,
+    memory-mapped ``columns``, ``null_report`` and ``null_runs``), or None.
+    """
+    path = _well_dir(key)
+    if path is None:
+        return None
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            return None
+        columns = {name: np.load(os.path.join(path, filename), mmap_mode="r")
+                   for name, filename in meta["columns"]}
+        with np.load(os.path.join(path, RUNS_FILE)) as runs:
+            null_runs = {name: runs[f"{i:04d}"] for i, name in enumerate(columns)
+                         if f"{i:04d}" in runs}
+        # Last use time drives pruning
+        os.utime(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return {
+        "header": meta["header"],
+        "columns": columns,
+        "null_report": {curve: {float(sentinel): int(count) for sentinel, count in found}
+                        for curve, found in meta["null_report"].items()},
+        "null_runs": null_runs,
+    }
+
+
+def _dir_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def prune(root=None, max_bytes=MAX_BYTES):
+    """Delete the least recently used stored wells until the store fits ``max_bytes``."""
+    root = root or store_dir()
+    if root is None or not os.path.isdir(root):
+        return
+    wells = []
+    for entry in os.scandir(root):
+        if entry.is_dir() and not entry.name.startswith("."):
+            wells.append((entry.stat().st_mtime, _dir_size(entry.path), entry.path))
+    total = sum(size for _, size, _ in wells)
+    for _, size, path in sorted(wells):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def clear():
+    """Remove every stored well."""
+    root = store_dir()
+    if root is not None:
+        shutil.rmtree(root, ignore_errors=True)
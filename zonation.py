@@ -0,0 +1,129 @@
+"""
+Zonation of the result curve for Formation Evaluation.
+
+Every sample is classified into the result_curves.CATEGORIES with one
+searchsorted call, consecutive samples of the same category are run-length
+encoded into zones, and zones thinner than a minimum thickness take the
+category of a thick neighbour (above, else below). Each step
+is a fixed number of array passes, so the zone table costs time linear in
+the number of samples. Merging only affects the displayed zones; findings
+come from the per-sample categories.
+"""
+import numpy as np
+import pandas as pd
+
+from result_curves import CATEGORIES, interval_statistics
+
+# Zones thinner than this (depth units) are merged into their neighbour
+MIN_THICKNESS = 5.0
+
+# Category code of null samples
+NULL = -1
+
+
+def classify(values):
+    """Return the index into CATEGORIES of every sample (NULL for NaN)."""
+    values = np.asarray(values, dtype=np.float64)
+    edges = [lower for _, lower, _ in CATEGORIES[1:]]
+    codes = np.searchsorted(edges, values, side="right")
+    codes[np.isnan(values)] = NULL
+    return codes
+
+
+def sample_edges(depth):
+    """
+    Depth boundaries of the samples: midway between neighbours, half a
+    step beyond the first and last sample. ``n + 1`` edges for ``n`` samples.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    if len(depth) < 2:
+        return np.concatenate((depth, depth))
+    middle = (depth[1:] + depth[:-1]) / 2
+    return np.concatenate(([1.5 * depth[0] - 0.5 * depth[1]], middle, [1.5 * depth[-1] - 0.5 * depth[-2]]))
+
+
+def runs(codes):
+    """Run-length encode ``codes`` into ``(starts, stops, codes)`` arrays."""
+    codes = np.asarray(codes)
+    if not len(codes):
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0, dtype=codes.dtype)
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+    stops = np.append(starts[1:], len(codes))
+    return starts, stops, codes[starts]
+
+
+def merge_thin(codes, edges, min_thickness):
+    """
+    Return ``codes`` with every zone thinner than ``min_thickness`` relabelled
+    with the category of the thick zone above it, or below it when a null
+    interval or the top of the log comes first. Null samples are never
+    relabelled, and a thin zone between two null intervals is kept as is.
+    """
+    codes = np.asarray(codes)
+    starts, stops, run_codes = runs(codes)
+    thickness = np.abs(edges[stops] - edges[starts])
+    thin = (thickness < min_thickness) & (run_codes != NULL)
+    if not thin.any():
+        return codes
+
+    # Samples of thick zones are the sources of the relabelling, null
+    # samples the barriers; look for the nearest of either in both directions
+    run_of = np.repeat(np.arange(len(starts)), stops - starts)
+    relabel = thin[run_of]
+    marks = ~relabel
+    rows = np.arange(len(codes))
+    above = np.maximum.accumulate(np.where(marks, rows, -1))
+    below = np.minimum.accumulate(np.where(marks, rows, len(codes))[::-1])[::-1]
+    padded = np.append(codes, NULL)  # row -1 and row len(codes) read as null
+    from_above = padded[above] != NULL
+    from_below = padded[below] != NULL
+    nearest = np.where(from_above, above, np.where(from_below, below, rows))
+    merged = codes.copy()
+    merged[relabel] = codes[nearest[relabel]]
+    return merged
+
+
+def zone_table(depth, values, min_thickness=MIN_THICKNESS):
+    """
+    Return the zones of a result curve as a DataFrame with Top, Base,
+    Thickness, Mean Porosity and Category, one row per zone in log order.
+    Null intervals are not zones.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    edges = sample_edges(depth)
+    codes = classify(values)
+    if min_thickness > 0:
+        codes = merge_thin(codes, edges, min_thickness)
+
+    starts, stops, run_codes = runs(codes)
+    keep = run_codes != NULL
+    starts, stops, run_codes = starts[keep], stops[keep], run_codes[keep]
+    top = np.minimum(edges[starts], edges[stops])
+    base = np.maximum(edges[starts], edges[stops])
+    names = np.array([name for name, _, _ in CATEGORIES], dtype=object)
+    return pd.DataFrame({
+        "Top": top,
+        "Base": base,
+        "Thickness": base - top,
+        "Mean Porosity": interval_statistics(values, starts, stops)["Mean"].to_numpy(),
+        "Category": names[run_codes],
+    })
+
+
+def findings(values):
+    """
+    Return the Formation Evaluation findings of a result curve: the problem
+    categories present in any sample, or ["Normal"] when every valid sample
+    is normal. Taken from the unmerged per-sample categories, so thin
+    problem intervals (cycle-skip artefacts) are reported even when the
+    zone table merges them away.
+    """
+    codes = classify(values)
+    counts = np.bincount(codes[codes != NULL], minlength=len(CATEGORIES))
+    present = {name for (name, _, _), count in zip(CATEGORIES, counts) if count}
+    problems = [name for name in ("Negative", "Anomaly", "Overestimate") if name in present]
+    if problems:
+        return problems
+    return ["Normal"] if "Normal" in present else []